@@ -1,25 +1,148 @@
 import chess
 import chess.pgn
+import concurrent.futures
 import pygame
-import cv2
 import numpy as np
 import pyttsx3
 from PIL import Image
+import hashlib
 import io
+import math
 import os
+import queue
+import shelve
+import subprocess
 from stockfish import Stockfish
 import sys
+import threading
 import time
-from moviepy.editor import VideoFileClip, AudioFileClip, CompositeVideoClip
+from moviepy.editor import AudioFileClip
+try:
+    import soundfile as sf
+except ImportError:
+    sf = None
 import requests
 import shutil
 from logger import Logger
+from fast_eval import popcount
+
+def _build_opening_trie():
+    """Build a prefix trie of opening lines keyed by Move objects.
+
+    Each node maps a Move to [opening_name_or_None, children], so the
+    current opening can be tracked with one dict lookup per move - the
+    moves on the stack are hashed directly, with no string building at all.
+    """
+    # Common openings and their move patterns
+    openings = {
+        # Main lines
+        "e2e4 e7e5": {
+            "name": "Open Game",
+            "variations": {
+                "g1f3 b8c6 f1b5": "Ruy Lopez",
+                "g1f3 b8c6 f1c4": "Italian Game",
+                "g1f3 b8c6 d2d4": "Scotch Game",
+                "f2f4": "King's Gambit",
+                "d2d4 e5d4": "Center Game"
+            }
+        },
+        "e2e4 c7c5": {
+            "name": "Sicilian Defense",
+            "variations": {
+                "g1f3 d7d6": "Sicilian Najdorf",
+                "g1f3 b8c6": "Sicilian Open",
+                "b1c3": "Sicilian Closed",
+                "c2c3": "Sicilian Alapin"
+            }
+        },
+        "e2e4 e7e6": {
+            "name": "French Defense",
+            "variations": {
+                "d2d4 d7d5": "French Main Line",
+                "d2d4 d7d5 e4e5": "French Advance",
+                "d2d4 d7d5 e4d5": "French Exchange"
+            }
+        },
+        "d2d4 d7d5": {
+            "name": "Queen's Pawn Game",
+            "variations": {
+                "c2c4": "Queen's Gambit",
+                "c2c4 d5c4": "Queen's Gambit Accepted",
+                "c2c4 e7e6": "Queen's Gambit Declined",
+                "g1f3 g8f6 c2c4": "Queen's Gambit Orthodox"
+            }
+        },
+        "d2d4 g8f6": {
+            "name": "Indian Defense",
+            "variations": {
+                "c2c4 e7e6 g1f3": "Nimzo-Indian Defense",
+                "c2c4 g7g6": "King's Indian Defense",
+                "c2c4 e7e6 g1f3 b7b6": "Queen's Indian Defense"
+            }
+        }
+    }
+
+    trie = {}
+
+    def insert(tokens, name):
+        node = trie
+        for i, token in enumerate(tokens):
+            entry = node.setdefault(chess.Move.from_uci(token), [None, {}])
+            if i == len(tokens) - 1:
+                entry[0] = name
+            node = entry[1]
+
+    for pattern, data in openings.items():
+        insert(pattern.split(), data["name"])
+        for var_pattern, var_name in data.get("variations", {}).items():
+            insert((pattern + " " + var_pattern).split(), var_name)
+
+    return trie
+
+# Built once at import; shared by all commentator instances
+_OPENING_TRIE = _build_opening_trie()
+
+# Bitboard of the four central squares
+_CENTER_BB = chess.BB_E4 | chess.BB_E5 | chess.BB_D4 | chess.BB_D5
+
+# Castling moves per side, built once instead of parsed from UCI per call
+_CASTLING_MOVES = {
+    chess.WHITE: (chess.Move(chess.E1, chess.G1), chess.Move(chess.E1, chess.C1)),
+    chess.BLACK: (chess.Move(chess.E8, chess.G8), chess.Move(chess.E8, chess.C8)),
+}
+
+# Squares off each side's back two ranks: a minor piece standing here
+# counts as developed
+_DEVEL_WHITE_BB = ~(chess.BB_RANK_1 | chess.BB_RANK_2) & chess.BB_ALL
+_DEVEL_BLACK_BB = ~(chess.BB_RANK_7 | chess.BB_RANK_8) & chess.BB_ALL
+
+# Signature moves of the named quick mates, pre-parsed so the checkmate
+# classifier compares Move objects instead of building strings per move
+_FOOLS_MATE_MOVES = frozenset(
+    chess.Move.from_uci(uci) for uci in ("f2f4", "g2g4")
+)
+_SCHOLARS_MATE_MOVES = frozenset(
+    chess.Move.from_uci(uci) for uci in ("f1c4", "d1h5", "d1f3")
+)
+
+# Basic mate names keyed by the sorted piece types attacking the mated king
+_MATE_PATTERN_TABLE = {
+    (chess.QUEEN,): "Queen Checkmate",
+    (chess.ROOK,): "Rook Checkmate",
+    (chess.ROOK, chess.ROOK): "Two-Rook Checkmate",
+    (chess.BISHOP, chess.BISHOP): "Two-Bishop Checkmate",
+    (chess.KNIGHT, chess.BISHOP): "Bishop and Knight Checkmate",
+}
 
 class ChessCommentator:
-    def __init__(self, stockfish_path=None):
+    def __init__(self, stockfish_path=None, interactive=False):
         try:
             Logger.info("Initializing Chess Commentator...")
-            
+
+            # Batch mode skips the event pump and frame-rate throttle so
+            # offline rendering runs as fast as ffmpeg can consume it
+            self.interactive = interactive
+
             # Initialize pygame
             if not pygame.get_init():
                 Logger.debug("Initializing Pygame...")
@@ -30,10 +153,38 @@ class ChessCommentator:
             self.BOARD_SIZE = self.SQUARE_SIZE * 8
             self.WINDOW_WIDTH = self.BOARD_SIZE + 300  # Extra space for info panel
             self.WINDOW_HEIGHT = self.BOARD_SIZE + 100  # Extra space for status
-            
-            # Create the main window
+
+            # Square -> pixel lookup tables, indexed by chess square (0-63),
+            # so the draw path never redoes the rank/file arithmetic
+            self._sq_topleft = []
+            self._sq_center = []
+            for sq in range(64):
+                x = (sq & 7) * self.SQUARE_SIZE
+                y = (7 - (sq >> 3)) * self.SQUARE_SIZE
+                self._sq_topleft.append((x, y))
+                self._sq_center.append((x + self.SQUARE_SIZE // 2,
+                                        y + self.SQUARE_SIZE // 2))
+
+            # Arrow-head sprites cached per (from, to, color)
+            self._arrow_heads = {}
+
+            # Dirty flag: the render path is skipped entirely when neither
+            # the tracked state nor the commentary changed since last draw
+            self._dirty = True
+            self._last_commentary = None
+            
+            # Create the main window. In batch mode it stays hidden: it is
+            # never flipped and its event queue is never pumped, so a
+            # visible window would just sit there "not responding"
             Logger.debug("Creating display window...")
-            self.window = pygame.display.set_mode((self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
+            window_flags = 0 if self.interactive else pygame.HIDDEN
+            self.window = pygame.display.set_mode(
+                (self.WINDOW_WIDTH, self.WINDOW_HEIGHT), window_flags)
+
+            # All drawing targets this offscreen 24bpp surface: frame
+            # captures skip the display surface's 32bpp pixel-format
+            # conversion, and the window is only updated when watching live
+            self.canvas = pygame.Surface((self.WINDOW_WIDTH, self.WINDOW_HEIGHT), 0, 24)
             pygame.display.set_caption("Chess Game Commentator")
             
             # Create surface for the chess board
@@ -41,6 +192,10 @@ class ChessCommentator:
             
             # Initialize board
             self.board = None
+
+            # Incremental square -> piece-char map kept in sync as moves are
+            # played, so draw_pieces never rebuilds piece_map per frame
+            self._piece_positions = None
             
             # Colors
             self.WHITE = (240, 217, 181)  # Light brown for white squares
@@ -55,20 +210,66 @@ class ChessCommentator:
             pygame.font.init()
             self.font = pygame.font.SysFont('Arial', 16)
             self.large_font = pygame.font.SysFont('Arial', 24)
+
+            # Word-wrap caches: space width plus measured word widths, so
+            # wrapping costs arithmetic instead of SDL_ttf calls per word
+            self._space_w = self.font.size(' ')[0]
+            self._word_widths = {}
+            self._wrap_cache = {}
+            self._wrap_cache_max = 256
+
+            # Rendered text surfaces, keyed by string/color/font; most panel
+            # strings repeat for many frames so rasterize each just once
+            self._text_cache = {}
+            self._text_cache_max = 256
+
+            # Move reasoning memo keyed by (position, side, move): study
+            # replays and transpositions repeat the exact same pairs
+            self._reasoning_cache = {}
+            self._reasoning_cache_max = 4096
+
+            # Pre-render the static board (squares + coordinates) once so
+            # draw_board is a single blit instead of 80+ draw calls per frame
+            Logger.debug("Pre-rendering board background...")
+            self._board_bg = self._create_board_background()
             
             # Initialize TTS engine
             Logger.info("Initializing Text-to-Speech engine...")
+            self.tts_engine = None
+            self.tts_backend = None
             try:
                 self.tts_engine = pyttsx3.init()
                 self.tts_engine.setProperty('rate', 150)
                 self.tts_engine.setProperty('volume', 0.9)
+                self.tts_backend = 'pyttsx3'
                 Logger.success("TTS engine initialized successfully")
             except Exception as e:
                 Logger.warning(f"TTS initialization failed: {e}")
-                self.tts_engine = None
+                # Fall back to gTTS (network synthesis) when installed
+                try:
+                    from gtts import gTTS  # noqa: F401
+                    self.tts_backend = 'gtts'
+                    Logger.success("Using gTTS fallback for speech synthesis")
+                except ImportError:
+                    Logger.warning("gTTS not installed - commentary will be silent")
+
+            # The engine is initialized exactly once and reused for the whole
+            # process; runAndWait drains its queue, so no stop() is needed
+            # between utterances. The flag tracks in-flight synthesis so
+            # cleanup only ever interrupts an engine that is actually busy.
+            self._tts_busy = False
+            if self.tts_backend == 'gtts':
+                self._tts_voice_tag = "gtts|en"
+            elif self.tts_engine:
+                self._tts_voice_tag = (f"{self.tts_engine.getProperty('rate')}|"
+                                       f"{self.tts_engine.getProperty('voice')}")
+            else:
+                self._tts_voice_tag = None
             
             # Initialize Stockfish if path is provided
             self.stockfish = None
+            self.stockfish_b = None
+            self.stockfish_path = stockfish_path
             if stockfish_path:
                 Logger.info(f"Initializing Stockfish engine from: {stockfish_path}")
                 try:
@@ -78,13 +279,29 @@ class ChessCommentator:
                     self.stockfish.set_skill_level(20)  # Maximum skill level
                     self.stockfish.update_engine_parameters({
                         "Hash": 128,  # Memory in MB
-                        "Threads": 4,  # Number of CPU threads
+                        "Threads": 2,  # Split CPU threads with the second engine
                         "MultiPV": 3,  # Show top 3 moves
                         "UCI_ShowWDL": True  # Show Win/Draw/Loss statistics
                     })
                     Logger.success("Stockfish engine initialized successfully")
                 except Exception as e:
                     Logger.warning(f"Stockfish initialization failed: {e}")
+
+                # Second engine so the off-turn side is analyzed in parallel
+                if self.stockfish:
+                    try:
+                        self.stockfish_b = Stockfish(path=stockfish_path)
+                        self.stockfish_b.set_depth(20)
+                        self.stockfish_b.set_skill_level(20)
+                        self.stockfish_b.update_engine_parameters({
+                            "Hash": 128,
+                            "Threads": 2,
+                            "MultiPV": 3,
+                            "UCI_ShowWDL": True
+                        })
+                        Logger.success("Second Stockfish engine initialized successfully")
+                    except Exception as e:
+                        Logger.warning(f"Second Stockfish initialization failed: {e}")
             
             # Load chess pieces
             Logger.info("Loading chess pieces...")
@@ -97,6 +314,31 @@ class ChessCommentator:
             self.total_moves = 0
             self.status_message = "Ready to analyze game"
             self.audio_segments = []
+            self._material_balance = 0  # running total; see update_captured_pieces
+            self._mainline = []   # cached mainline moves of the loaded game
+            self._halfmoves = 0   # half-moves played so far (avoids move_stack len on draw path)
+
+            # Single worker thread so Stockfish analysis overlaps rendering;
+            # the engine process itself is created once and reused
+            self._analysis_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            # Worker that drives the second engine for the off-turn side
+            self._side_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            # Worker that synthesizes speech while the engine and encoder run
+            self._tts_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+            # ffmpeg binary and video encoder argv, resolved on first use
+            self._ffmpeg_exe = None
+            self._encoder_args = None
+
+            # FEN-keyed analysis cache: dict for this run, shelve so repeat
+            # positions (and re-runs of the same game) skip Stockfish
+            self._eval_cache = {}
+            self._eval_cache_max = 4096
+            try:
+                self._eval_shelf = shelve.open("analysis.cache")
+            except Exception as e:
+                Logger.warning(f"Could not open analysis cache file: {e}")
+                self._eval_shelf = None
             
             # Add arrow color
             self.ARROW_COLOR = (255, 0, 0)  # Red arrows
@@ -112,6 +354,11 @@ class ChessCommentator:
                 'last_move': None,
                 'current_opening': None
             }
+
+            # Opening trie walk state (see _build_opening_trie)
+            self._opening_node = _OPENING_TRIE
+            self._opening_name = None
+            self._opening_ply = 0
             
             # Add computer analysis arrow colors
             self.COMPUTER_ARROW_COLOR_WHITE = (128, 128, 128, 180)  # Semi-transparent gray for White
@@ -168,11 +415,48 @@ class ChessCommentator:
             Logger.error(f"Error initializing Chess Commentator: {e}")
             raise
             
+    # Piece order in the on-disk atlas strip
+    ATLAS_ORDER = "KQRBNPkqrbnp"
+
+    # Synthesized commentary audio is cached here across runs
+    TTS_CACHE_DIR = "tts_cache"
+
+    def _tts_cache_path(self, text):
+        """Cache file for an utterance, keyed by text and voice settings."""
+        key = hashlib.md5(f"{text}|{self._tts_voice_tag}".encode()).hexdigest()
+        return os.path.join(self.TTS_CACHE_DIR, f"{key}.mp3")
+
+    def _synthesize_speech(self, text):
+        """Synthesize text to an audio file, reusing cached output.
+
+        Commentary strings are highly repetitive ("White pawn moves from
+        e2 to e4"), so files are keyed by a hash of the text plus the
+        voice settings and reused across moves and games.
+        """
+        if not self.tts_backend:
+            return None
+        os.makedirs(self.TTS_CACHE_DIR, exist_ok=True)
+        audio_file = self._tts_cache_path(text)
+        if os.path.exists(audio_file):
+            Logger.debug(f"TTS cache hit for: {text[:40]}...")
+            return audio_file
+        if self.tts_backend == 'gtts':
+            from gtts import gTTS
+            gTTS(text=text, lang='en').save(audio_file)
+        else:
+            self._tts_busy = True
+            try:
+                self.tts_engine.save_to_file(text, audio_file)
+                self.tts_engine.runAndWait()
+            finally:
+                self._tts_busy = False
+        return audio_file
+
     def load_piece_images(self):
         """Load chess piece images into pygame surfaces."""
         try:
             Logger.info("Loading piece images into pygame surfaces...")
-            
+
             # Define piece mappings with clearer names
             pieces = {
                 'K': 'king-w.png',
@@ -188,20 +472,34 @@ class ChessCommentator:
                 'n': 'knight-b.png',
                 'p': 'pawn-b.png'
             }
-            
-            # Map piece characters to full names for commentary
+
+            # Map piece types to spoken names for commentary; keyed by
+            # chess.PieceType int so lookups skip str()/lower() per call
             self.piece_names = {
-                'K': 'King', 'Q': 'Queen', 'R': 'Rook',
-                'B': 'Bishop', 'N': 'Knight', 'P': 'Pawn',
-                'k': 'king', 'q': 'queen', 'r': 'rook',
-                'b': 'bishop', 'n': 'knight', 'p': 'pawn'
+                chess.PAWN: 'pawn', chess.KNIGHT: 'knight',
+                chess.BISHOP: 'bishop', chess.ROOK: 'rook',
+                chess.QUEEN: 'queen', chess.KING: 'king'
             }
-            
+
+            # Fast path: a pre-scaled atlas strip means one decode and no
+            # smoothscale calls at startup
+            atlas_path = f"pieces/atlas_{self.SQUARE_SIZE}.png"
+            if os.path.exists(atlas_path):
+                Logger.debug(f"Loading piece atlas: {atlas_path}")
+                atlas = pygame.image.load(atlas_path).convert_alpha()
+                for i, piece_char in enumerate(self.ATLAS_ORDER):
+                    self.pieces[piece_char] = atlas.subsurface(
+                        (i * self.SQUARE_SIZE, 0, self.SQUARE_SIZE, self.SQUARE_SIZE))
+                self._build_small_pieces()
+                Logger.success("All piece images loaded from atlas")
+                return True
+
             for piece_char, png_file in pieces.items():
                 png_path = f"pieces/{png_file}"
                 try:
-                    # Load PNG directly with pygame
-                    surface = pygame.image.load(png_path)
+                    # Load PNG directly with pygame and convert to the display
+                    # format so per-frame blits take the fast SDL path
+                    surface = pygame.image.load(png_path).convert_alpha()
                     # Scale to square size
                     surface = pygame.transform.smoothscale(surface, (self.SQUARE_SIZE, self.SQUARE_SIZE))
                     self.pieces[piece_char] = surface
@@ -209,14 +507,34 @@ class ChessCommentator:
                 except Exception as e:
                     Logger.error(f"Error loading {png_file}: {e}")
                     return False
-            
+
+            # Save the scaled pieces as an atlas so the next startup takes
+            # the fast path above
+            try:
+                atlas = pygame.Surface((self.SQUARE_SIZE * len(self.ATLAS_ORDER), self.SQUARE_SIZE),
+                                       pygame.SRCALPHA)
+                for i, piece_char in enumerate(self.ATLAS_ORDER):
+                    atlas.blit(self.pieces[piece_char], (i * self.SQUARE_SIZE, 0))
+                pygame.image.save(atlas, atlas_path)
+                Logger.debug(f"Saved piece atlas: {atlas_path}")
+            except Exception as e:
+                Logger.warning(f"Could not save piece atlas: {e}")
+
+            self._build_small_pieces()
             Logger.success("All piece images loaded successfully")
             return True
-            
+
         except Exception as e:
             Logger.error(f"Error loading piece images: {e}")
             return False
-            
+
+    def _build_small_pieces(self):
+        """Pre-scale the 25x25 captured-piece sprites once at load time."""
+        self._small_pieces = {
+            piece_char: pygame.transform.smoothscale(surface, (25, 25)).convert_alpha()
+            for piece_char, surface in self.pieces.items()
+        }
+
     def show_error_message(self, message):
         Logger.error(f"Displaying error message: {message}")
         if pygame.get_init():
@@ -240,7 +558,15 @@ class ChessCommentator:
                     raise ValueError("No game found in PGN file")
                     
                 self.board = self.game.board()
-                self.total_moves = sum(1 for _ in self.game.mainline_moves())
+                # Walk the mainline once and cache it; everything else reuses the list
+                self._mainline = list(self.game.mainline_moves())
+                self.total_moves = len(self._mainline)
+                self._halfmoves = 0
+
+                # Reset the opening trie walk for the new game
+                self._opening_node = _OPENING_TRIE
+                self._opening_name = None
+                self._opening_ply = 0
                 Logger.success(f"Successfully loaded game with {self.total_moves} moves")
                 return self.game
                 
@@ -249,147 +575,182 @@ class ChessCommentator:
             self.show_error_message(f"Error loading PGN: {str(e)}")
             return None
             
-    def draw_board(self):
-        Logger.debug("Drawing chess board...")
-        # Draw the board directly on the window, not the screen
+    def _create_board_background(self):
+        """Render the empty board with rank/file labels into a single surface."""
+        background = pygame.Surface((self.BOARD_SIZE, self.BOARD_SIZE)).convert()
         for row in range(8):
             for col in range(8):
                 color = self.WHITE if (row + col) % 2 == 0 else self.BLACK
-                pygame.draw.rect(self.window, color,
+                pygame.draw.rect(background, color,
                                (col * self.SQUARE_SIZE, row * self.SQUARE_SIZE,
                                 self.SQUARE_SIZE, self.SQUARE_SIZE))
-                
+
                 # Draw rank numbers (1-8) on the left side
                 if col == 0:
-                    rank_label = self.font.render(str(8 - row), True, 
+                    rank_label = self.font.render(str(8 - row), True,
                                                 self.BLACK if (row % 2 == 0) else self.WHITE)
-                    self.window.blit(rank_label, 
+                    background.blit(rank_label,
                                    (5, row * self.SQUARE_SIZE + 5))
-                
+
                 # Draw file letters (a-h) on the bottom
                 if row == 7:
                     file_label = self.font.render(chr(97 + col), True,
                                                 self.WHITE if (col % 2 == 0) else self.BLACK)
-                    self.window.blit(file_label,
+                    background.blit(file_label,
                                    (col * self.SQUARE_SIZE + self.SQUARE_SIZE - 20,
                                     row * self.SQUARE_SIZE + self.SQUARE_SIZE - 20))
+        return background
+
+    def draw_board(self):
+        Logger.debug("Drawing chess board...")
+        # Blit the pre-rendered background instead of redrawing every square
+        self.canvas.blit(self._board_bg, (0, 0))
                                 
     def draw_arrow(self, start_square, end_square, color):
         """Draw an arrow from one square to another."""
-        # Calculate center points of squares
-        start_col, start_row = start_square % 8, 7 - (start_square // 8)
-        end_col, end_row = end_square % 8, 7 - (end_square // 8)
-        
-        start_x = start_col * self.SQUARE_SIZE + self.SQUARE_SIZE // 2
-        start_y = start_row * self.SQUARE_SIZE + self.SQUARE_SIZE // 2
-        end_x = end_col * self.SQUARE_SIZE + self.SQUARE_SIZE // 2
-        end_y = end_row * self.SQUARE_SIZE + self.SQUARE_SIZE // 2
+        # Look up the square centers
+        start_x, start_y = self._sq_center[start_square]
+        end_x, end_y = self._sq_center[end_square]
         
         # Draw the arrow line
-        pygame.draw.line(self.window, color, 
-                        (start_x, start_y), (end_x, end_y), 
+        pygame.draw.line(self.canvas, color,
+                        (start_x, start_y), (end_x, end_y),
                         self.ARROW_WIDTH)
-        
-        # Calculate arrow head
-        angle = np.arctan2(end_y - start_y, end_x - start_x)
-        arrow_size = 20
-        arrow_angle = np.pi / 6  # 30 degrees
-        
-        # Calculate arrow head points
-        point1 = (end_x - arrow_size * np.cos(angle - arrow_angle),
-                 end_y - arrow_size * np.sin(angle - arrow_angle))
-        point2 = (end_x - arrow_size * np.cos(angle + arrow_angle),
-                 end_y - arrow_size * np.sin(angle + arrow_angle))
-        
+
+        # Arrow head: geometry is fixed per square pair, so rasterize the
+        # triangle into a small sprite once and blit it on later frames
+        head = self._arrow_heads.get((start_square, end_square, color))
+        if head is None:
+            dx = end_x - start_x
+            dy = end_y - start_y
+            length = math.hypot(dx, dy)
+            if length == 0:
+                return
+            arrow_size = 20
+            ux, uy = dx / length, dy / length
+            # Rotate the unit vector by +/-30 degrees without trig calls
+            c, s = 0.8660254037844387, 0.5
+            point1 = (end_x - arrow_size * (ux * c + uy * s),
+                      end_y - arrow_size * (uy * c - ux * s))
+            point2 = (end_x - arrow_size * (ux * c - uy * s),
+                      end_y - arrow_size * (uy * c + ux * s))
+            points = [(end_x, end_y), point1, point2]
+
+            min_x = int(min(p[0] for p in points)) - 1
+            min_y = int(min(p[1] for p in points)) - 1
+            width = int(max(p[0] for p in points)) + 2 - min_x
+            height = int(max(p[1] for p in points)) + 2 - min_y
+            sprite = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.polygon(sprite, color,
+                                [(p[0] - min_x, p[1] - min_y) for p in points])
+            head = (sprite.convert_alpha(), (min_x, min_y))
+            self._arrow_heads[(start_square, end_square, color)] = head
+
         # Draw arrow head
-        pygame.draw.polygon(self.window, color,
-                          [(end_x, end_y), point1, point2])
+        self.canvas.blit(head[0], head[1])
 
     def draw_circle(self, square, color):
         """Draw a circle around a square to highlight it."""
-        col = square % 8
-        row = 7 - (square // 8)
-        center_x = col * self.SQUARE_SIZE + self.SQUARE_SIZE // 2
-        center_y = row * self.SQUARE_SIZE + self.SQUARE_SIZE // 2
-        pygame.draw.circle(self.window, color, (center_x, center_y), 
+        center_x, center_y = self._sq_center[square]
+        pygame.draw.circle(self.canvas, color, (center_x, center_y),
                          self.CIRCLE_RADIUS, self.CIRCLE_WIDTH)
 
+    def _reset_piece_positions(self, board):
+        """Rebuild the incremental square -> piece-char map from a board."""
+        self._piece_positions = {sq: str(piece) for sq, piece in board.piece_map().items()}
+
+    def _apply_move_to_positions(self, board, move):
+        """Update the piece map for a move; call with the board *before* the push."""
+        if self._piece_positions is None:
+            return
+        positions = self._piece_positions
+        piece_char = positions.pop(move.from_square, None)
+        if piece_char is None:
+            # Out of sync - force a full rebuild on the next draw
+            self._piece_positions = None
+            return
+
+        if board.is_en_passant(move):
+            captured_sq = move.to_square + (-8 if board.turn == chess.WHITE else 8)
+            positions.pop(captured_sq, None)
+        elif board.is_castling(move):
+            # The rook jumps too
+            if chess.square_file(move.to_square) == 6:  # kingside
+                rook_from = chess.H1 if board.turn == chess.WHITE else chess.H8
+                rook_to = chess.F1 if board.turn == chess.WHITE else chess.F8
+            else:
+                rook_from = chess.A1 if board.turn == chess.WHITE else chess.A8
+                rook_to = chess.D1 if board.turn == chess.WHITE else chess.D8
+            rook_char = positions.pop(rook_from, None)
+            if rook_char is not None:
+                positions[rook_to] = rook_char
+
+        if move.promotion:
+            symbol = chess.piece_symbol(move.promotion)
+            piece_char = symbol.upper() if board.turn == chess.WHITE else symbol
+
+        positions[move.to_square] = piece_char
+
+    def _resolve_suggestion_draw(self, suggestion, default_color):
+        """Resolve a suggestion's arrow move and colors once per analysis.
+
+        The tuple is cached on the suggestion dict itself, so the per-frame
+        draw path reduces to a dict lookup while the analysis is on screen.
+        """
+        draw = suggestion.get('_draw')
+        if draw is None:
+            move = chess.Move.from_uci(suggestion['move'])
+            score = suggestion.get('score')
+            mate = suggestion.get('mate')
+            # Convert mate score to centipawns for comparison
+            if mate is not None:
+                score = self.MATE_SCORE if mate > 0 else -self.MATE_SCORE
+            arrow_color = default_color
+            circle_color = None
+            if score is not None:
+                if score <= self.BLUNDER_THRESHOLD:
+                    arrow_color = circle_color = self.BLUNDER_COLOR
+                elif score <= self.MISTAKE_THRESHOLD:
+                    arrow_color = circle_color = self.MISTAKE_COLOR
+                elif score >= self.MISSED_WIN_THRESHOLD:
+                    arrow_color = circle_color = self.MISSED_WIN_COLOR
+            draw = (move, arrow_color, circle_color)
+            suggestion['_draw'] = draw
+        return draw
+
     def draw_pieces(self, board):
         Logger.debug("Drawing chess pieces...")
-        piece_map = board.piece_map()
-        
-        # Draw computer suggestion arrows first
+        if self._piece_positions is None:
+            self._reset_piece_positions(board)
+        piece_map = self._piece_positions
+
+        # Draw computer suggestion arrows first; the resolved move and
+        # colors are cached on each suggestion dict, so redraws of an
+        # unchanged analysis skip the UCI parse and threshold checks
         if self.stockfish and self.computer_suggestions:
-            # Draw White's suggestion
-            if self.computer_suggestions['white']:
-                move = chess.Move.from_uci(self.computer_suggestions['white']['move'])
-                score = self.computer_suggestions['white'].get('score')
-                mate = self.computer_suggestions['white'].get('mate')
-                
-                # Convert mate score to centipawns for comparison
-                if mate is not None:
-                    score = self.MATE_SCORE if mate > 0 else -self.MATE_SCORE
-                
-                # Determine arrow color based on evaluation
-                if score is not None:  # Only evaluate if we have a score
-                    if score <= self.BLUNDER_THRESHOLD:
-                        arrow_color = self.BLUNDER_COLOR
-                        self.draw_circle(move.from_square, self.BLUNDER_COLOR)
-                    elif score <= self.MISTAKE_THRESHOLD:
-                        arrow_color = self.MISTAKE_COLOR
-                        self.draw_circle(move.from_square, self.MISTAKE_COLOR)
-                    elif score >= self.MISSED_WIN_THRESHOLD:
-                        arrow_color = self.MISSED_WIN_COLOR
-                        self.draw_circle(move.from_square, self.MISSED_WIN_COLOR)
-                    else:
-                        arrow_color = self.COMPUTER_ARROW_COLOR_WHITE
-                else:
-                    arrow_color = self.COMPUTER_ARROW_COLOR_WHITE
-                
-                if (move.from_square != self.last_move_from or 
-                    move.to_square != self.last_move_to):
-                    self.draw_arrow(move.from_square, move.to_square, arrow_color)
-            
-            # Draw Black's suggestion similarly
-            if self.computer_suggestions['black']:
-                move = chess.Move.from_uci(self.computer_suggestions['black']['move'])
-                score = self.computer_suggestions['black'].get('score')
-                mate = self.computer_suggestions['black'].get('mate')
-                
-                # Convert mate score to centipawns for comparison
-                if mate is not None:
-                    score = self.MATE_SCORE if mate > 0 else -self.MATE_SCORE
-                
-                # Determine arrow color based on evaluation
-                if score is not None:  # Only evaluate if we have a score
-                    if score <= self.BLUNDER_THRESHOLD:
-                        arrow_color = self.BLUNDER_COLOR
-                        self.draw_circle(move.from_square, self.BLUNDER_COLOR)
-                    elif score <= self.MISTAKE_THRESHOLD:
-                        arrow_color = self.MISTAKE_COLOR
-                        self.draw_circle(move.from_square, self.MISTAKE_COLOR)
-                    elif score >= self.MISSED_WIN_THRESHOLD:
-                        arrow_color = self.MISSED_WIN_COLOR
-                        self.draw_circle(move.from_square, self.MISSED_WIN_COLOR)
-                    else:
-                        arrow_color = self.COMPUTER_ARROW_COLOR_BLACK
-                else:
-                    arrow_color = self.COMPUTER_ARROW_COLOR_BLACK
-                
-                if (move.from_square != self.last_move_from or 
-                    move.to_square != self.last_move_to):
+            for side, default_color in (('white', self.COMPUTER_ARROW_COLOR_WHITE),
+                                        ('black', self.COMPUTER_ARROW_COLOR_BLACK)):
+                suggestion = self.computer_suggestions.get(side)
+                if not suggestion:
+                    continue
+                move, arrow_color, circle_color = self._resolve_suggestion_draw(
+                    suggestion, default_color)
+                if circle_color is not None:
+                    self.draw_circle(move.from_square, circle_color)
+                if (move.from_square != self.last_move_from or
+                        move.to_square != self.last_move_to):
                     self.draw_arrow(move.from_square, move.to_square, arrow_color)
         
-        # Draw pieces
-        for square, piece in piece_map.items():
-            row = 7 - (square // 8)
-            col = square % 8
-            piece_char = str(piece)
-            if piece_char in self.pieces:
-                self.window.blit(self.pieces[piece_char],
-                               (col * self.SQUARE_SIZE, row * self.SQUARE_SIZE))
+        # Draw pieces in one batched call instead of per-piece blits
+        blit_seq = []
+        for square, piece_char in piece_map.items():
+            piece_surface = self.pieces.get(piece_char)
+            if piece_surface is not None:
+                blit_seq.append((piece_surface, self._sq_topleft[square]))
             else:
                 Logger.warning(f"Missing piece image for: {piece_char}")
+        if blit_seq:
+            self.canvas.blits(blit_seq, doreturn=0)
         
         # Draw last move arrow on top
         if self.last_move_from is not None and self.last_move_to is not None:
@@ -398,45 +759,45 @@ class ChessCommentator:
     def draw_info_panel(self, commentary):
         Logger.debug("Drawing info panel...")
         # Draw info panel background
-        pygame.draw.rect(self.window, self.BG_COLOR,
+        pygame.draw.rect(self.canvas, self.BG_COLOR,
                         (self.BOARD_SIZE, 0, 300, self.WINDOW_HEIGHT))
         
         # Draw move counter
-        move_text = self.large_font.render(f"Move: {self.current_move}/{self.total_moves}",
-                                         True, self.TITLE_COLOR)
-        self.window.blit(move_text, (self.BOARD_SIZE + 10, 10))
+        move_text = self._render_text(f"Move: {self.current_move}/{self.total_moves}",
+                                      self.TITLE_COLOR, self.large_font)
+        self.canvas.blit(move_text, (self.BOARD_SIZE + 10, 10))
         
         # Add legend for colored circles
         y = 50
-        legend_title = self.font.render("Event Indicators:", True, self.TITLE_COLOR)
-        self.window.blit(legend_title, (self.BOARD_SIZE + 10, y))
+        legend_title = self._render_text("Event Indicators:", self.TITLE_COLOR)
+        self.canvas.blit(legend_title, (self.BOARD_SIZE + 10, y))
         y += 25
         
         # Blunder explanation
-        blunder_text = self.font.render("⭕ Blunder (eval drops >2.00)", True, self.BLUNDER_COLOR)
-        self.window.blit(blunder_text, (self.BOARD_SIZE + 10, y))
+        blunder_text = self._render_text("⭕ Blunder (eval drops >2.00)", self.BLUNDER_COLOR)
+        self.canvas.blit(blunder_text, (self.BOARD_SIZE + 10, y))
         y += 25
         
         # Mistake explanation
-        mistake_text = self.font.render("⭕ Mistake (eval drops >1.00)", True, self.MISTAKE_COLOR)
-        self.window.blit(mistake_text, (self.BOARD_SIZE + 10, y))
+        mistake_text = self._render_text("⭕ Mistake (eval drops >1.00)", self.MISTAKE_COLOR)
+        self.canvas.blit(mistake_text, (self.BOARD_SIZE + 10, y))
         y += 25
         
         # Missed win explanation
-        missed_win_text = self.font.render("⭕ Missed Win (eval >3.00)", True, self.MISSED_WIN_COLOR)
-        self.window.blit(missed_win_text, (self.BOARD_SIZE + 10, y))
+        missed_win_text = self._render_text("⭕ Missed Win (eval >3.00)", self.MISSED_WIN_COLOR)
+        self.canvas.blit(missed_win_text, (self.BOARD_SIZE + 10, y))
         y += 25
         
         # Good move explanation
-        good_move_text = self.font.render("⭕ Good Move", True, self.GOOD_MOVE_COLOR)
-        self.window.blit(good_move_text, (self.BOARD_SIZE + 10, y))
+        good_move_text = self._render_text("⭕ Good Move", self.GOOD_MOVE_COLOR)
+        self.canvas.blit(good_move_text, (self.BOARD_SIZE + 10, y))
         y += 35
 
         # Draw bullet point list of current state
         bullet_points = []
         
         # Add current opening if available and within first 15 moves
-        move_count = len(self.board.move_stack) // 2  # Convert half-moves to full moves
+        move_count = self._halfmoves >> 1  # Convert half-moves to full moves
         if self.state['current_opening'] and move_count <= 15:
             bullet_points.append(f"• Opening: {self.state['current_opening']}")
         
@@ -511,33 +872,20 @@ class ChessCommentator:
         
         # Draw all bullet points
         for point in bullet_points:
-            text = self.font.render(point, True, self.TEXT_COLOR)
-            self.window.blit(text, (self.BOARD_SIZE + 10, y))
+            text = self._render_text(point, self.TEXT_COLOR)
+            self.canvas.blit(text, (self.BOARD_SIZE + 10, y))
             y += 25
         
         # Draw commentary below bullet points
         if commentary:
             y += 10  # Add some space
-            words = commentary.split()
-            lines = []
-            current_line = []
-            for word in words:
-                current_line.append(word)
-                text = ' '.join(current_line)
-                if self.font.size(text)[0] > 280:
-                    current_line.pop()
-                    lines.append(' '.join(current_line))
-                    current_line = [word]
-            if current_line:
-                lines.append(' '.join(current_line))
-            
-            for line in lines:
-                text = self.font.render(line, True, self.TEXT_COLOR)
-                self.window.blit(text, (self.BOARD_SIZE + 10, y))
+            for line in self._wrap_text(commentary, 280):
+                text = self._render_text(line, self.TEXT_COLOR)
+                self.canvas.blit(text, (self.BOARD_SIZE + 10, y))
                 y += 25
         
         # Draw separator line
-        pygame.draw.line(self.window, self.TEXT_COLOR,
+        pygame.draw.line(self.canvas, self.TEXT_COLOR,
                         (self.BOARD_SIZE, 0),
                         (self.BOARD_SIZE, self.WINDOW_HEIGHT),
                         2)
@@ -548,191 +896,367 @@ class ChessCommentator:
         
         # Draw captured pieces
         self.draw_captured_pieces()
-        
-        # Update display
-        pygame.display.flip()
-                               
+
+    def _render_text(self, text, color, font=None):
+        """Rasterize a string once and reuse the surface on later frames."""
+        font = font or self.font
+        key = (text, color, font is self.large_font)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            if len(self._text_cache) >= self._text_cache_max:
+                self._text_cache.pop(next(iter(self._text_cache)))
+            surface = font.render(text, True, color).convert_alpha()
+            self._text_cache[key] = surface
+        return surface
+
+    def render_frame(self, commentary=None):
+        """Redraw the window; no-op when nothing changed since the last draw."""
+        if not self._dirty and commentary == self._last_commentary:
+            return False
+        self.canvas.fill(self.BG_COLOR)
+        self.draw_board()
+        self.draw_pieces(self.board)
+        self.draw_info_panel(commentary)
+        self._last_commentary = commentary
+        self._dirty = False
+        # Present to the window only when someone is watching
+        if self.interactive:
+            self.window.blit(self.canvas, (0, 0))
+            pygame.display.flip()
+        return True
+
+    def _reset_game_state(self):
+        """Reset per-game tracking so the loaded game can be replayed from move one."""
+        self.board = self.game.board()
+        self._reset_piece_positions(self.board)
+        self.current_move = 0
+        self._halfmoves = 0
+        self.last_move_from = None
+        self.last_move_to = None
+        self.captured_pieces = {'white': [], 'black': []}
+        self._material_balance = self._count_material(self.board)
+        self.material_balance_history = []
+        self.state = {
+            'center_control': None,
+            'development': None,
+            'king_safety': None,
+            'last_move': None,
+            'current_opening': None
+        }
+        self._opening_node = _OPENING_TRIE
+        self._opening_name = None
+        self._opening_ply = 0
+        self.player_scores = {'white': 100, 'black': 100}
+        self.notable_moves = {
+            'blunders': {'white': [], 'black': []},
+            'mistakes': {'white': [], 'black': []},
+            'good_moves': {'white': [], 'black': []},
+            'missed_wins': {'white': [], 'black': []}
+        }
+        self._dirty = True
+
+    def _prefetch_commentary_audio(self, max_workers=4):
+        """Pre-generate all commentary and synthesize its audio up front.
+
+        Walks the whole mainline once collecting the commentary strings,
+        then warms the on-disk TTS cache so the render loop's per-move
+        synthesis requests are all hits. gTTS requests run on several
+        workers; pyttsx3 queues every missing utterance and drains the
+        engine event loop once, instead of paying a runAndWait cycle per
+        move. Callers must _reset_game_state afterwards.
+        """
+        Logger.info("Pre-synthesizing commentary audio...")
+        texts = []
+        for i, move in enumerate(self._mainline):
+            self.current_move = i + 1
+            texts.append(self.generate_commentary(self.board, move, None))
+            self.board.push(move)
+
+        if self.tts_backend == 'pyttsx3':
+            os.makedirs(self.TTS_CACHE_DIR, exist_ok=True)
+            queued = 0
+            self._tts_busy = True
+            try:
+                for text in texts:
+                    audio_file = self._tts_cache_path(text)
+                    if not os.path.exists(audio_file):
+                        self.tts_engine.save_to_file(text, audio_file)
+                        queued += 1
+                if queued:
+                    # One event-loop run drains the whole queue
+                    self.tts_engine.runAndWait()
+            finally:
+                self._tts_busy = False
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+                list(pool.map(self._synthesize_speech, texts))
+        Logger.success(f"Pre-synthesized audio for {len(texts)} moves")
+
+    def _wrap_text(self, text, max_width):
+        """Greedy word-wrap using cached per-word pixel widths.
+
+        The wrapped lines themselves are memoized too: the same commentary
+        is redrawn for every frame it stays on screen.
+        """
+        cache_key = (text, max_width)
+        cached = self._wrap_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        lines = []
+        current_line = []
+        line_width = 0
+        for word in text.split():
+            width = self._word_widths.get(word)
+            if width is None:
+                width = self.font.size(word)[0]
+                self._word_widths[word] = width
+            needed = width if not current_line else width + self._space_w
+            if current_line and line_width + needed > max_width:
+                lines.append(' '.join(current_line))
+                current_line = [word]
+                line_width = width
+            else:
+                current_line.append(word)
+                line_width += needed
+        if current_line:
+            lines.append(' '.join(current_line))
+        if len(self._wrap_cache) >= self._wrap_cache_max:
+            self._wrap_cache.pop(next(iter(self._wrap_cache)))
+        self._wrap_cache[cache_key] = lines
+        return lines
+
+
+    def _get_side_suggestion(self, engine, board, fen=None):
+        """Run one engine over a position and build the suggestion for the side to move."""
+        # Set position in Stockfish with a single FEN (never a replayed move
+        # list). Send ucinewgame only for an engine's first position: the
+        # token clears the transposition table, and successive plies of the
+        # same game want the hash entries from the previous searches
+        engine.set_fen_position(fen if fen is not None else board.fen(),
+                                not getattr(engine, '_tt_primed', False))
+        engine._tt_primed = True
+
+        # Get current side's best moves
+        current_analysis = engine.get_top_moves(3)  # Get top 3 moves
+        if not current_analysis:
+            return None
+
+        best_move = current_analysis[0]
+        move_uci = best_move['Move']
+        move = chess.Move.from_uci(move_uci)
+
+        # Get evaluation
+        eval_score = best_move.get('Centipawn')
+        mate_in = best_move.get('Mate')
+
+        # Format evaluation text
+        if mate_in is not None:
+            eval_text = f"Mate in {mate_in}"
+        else:
+            eval_text = f"{eval_score/100:.1f}" if eval_score is not None else "?"
+
+        # Get move reasoning and consequences
+        reasoning = self.get_move_reasoning(board, move)
+        consequences = self.analyze_move_consequences(board, move)
+
+        return {
+            'move': move_uci,
+            'score': eval_score,
+            'mate': mate_in,
+            'text': f"Best move: {move_uci} ({eval_text})",
+            'reasoning': reasoning,
+            'consequences': consequences,
+            'alternatives': [
+                {
+                    'move': m['Move'],
+                    'score': m.get('Centipawn'),
+                    'mate': m.get('Mate'),
+                    'reasoning': self.get_move_reasoning(board, chess.Move.from_uci(m['Move'])),
+                    'consequences': self.analyze_move_consequences(board, chess.Move.from_uci(m['Move']))
+                } for m in current_analysis[1:3]  # Get next 2 best moves
+            ]
+        }
+
+    def _make_worker_engine(self):
+        """Spawn one extra Stockfish process for an analysis prefetch worker."""
+        try:
+            engine = Stockfish(path=self.stockfish_path)
+            engine.set_depth(20)
+            engine.set_skill_level(20)
+            engine.update_engine_parameters({
+                "Hash": 64,
+                "Threads": 1,  # one CPU thread each; parallelism comes from the pool
+                "MultiPV": 3,
+                "UCI_ShowWDL": True
+            })
+            return engine
+        except Exception as e:
+            Logger.warning(f"Prefetch engine initialization failed: {e}")
+            return None
+
+    def _prefetch_analysis(self, game, max_workers=None):
+        """Analyze every mainline position before the render loop starts.
+
+        Engine search dwarfs the rest of the per-move cost, so a small pool
+        of extra Stockfish processes (one per worker thread; the search runs
+        outside the GIL) walks the game up front and fills the FEN-keyed
+        cache that analyze_position consults. The render loop then only ever
+        sees cache hits.
+        """
+        if not self.stockfish:
+            return
+        if max_workers is None:
+            max_workers = max(1, (os.cpu_count() or 2) // 2)
+
+        # Collect the positions the cache doesn't already cover. The render
+        # loop analyzes the position *before* each move is played, so the
+        # pre-push FEN is the cache key - starting position included, and
+        # the terminal position (which is never looked up) excluded.
+        fens = []
+        board = game.board()
+        for move in game.mainline_moves():
+            fen = board.fen()
+            board.push(move)
+            if fen in self._eval_cache:
+                continue
+            if self._eval_shelf is not None and fen in self._eval_shelf:
+                continue
+            fens.append(fen)
+        if not fens:
+            return
+
+        Logger.info(f"Prefetching analysis for {len(fens)} positions "
+                    f"with {max_workers} engine workers...")
+        local = threading.local()
+
+        def analyze(fen):
+            engine = getattr(local, 'engine', None)
+            if engine is None:
+                engine = local.engine = self._make_worker_engine()
+            if engine is None:
+                return None
+            board = chess.Board(fen)
+            suggestions = {'white': None, 'black': None}
+            side_to_move = 'white' if board.turn == chess.WHITE else 'black'
+            other_side = 'black' if side_to_move == 'white' else 'white'
+            suggestions[side_to_move] = self._get_side_suggestion(engine, board, fen=fen)
+            if not board.is_check():
+                null_board = board.copy(stack=False)
+                null_board.push(chess.Move.null())
+                suggestions[other_side] = self._get_side_suggestion(engine, null_board)
+            return suggestions
+
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+                # Consume in order; the cache is only written from this thread
+                for fen, suggestions in zip(fens, pool.map(analyze, fens)):
+                    if suggestions is None:
+                        continue
+                    if len(self._eval_cache) >= self._eval_cache_max:
+                        self._eval_cache.pop(next(iter(self._eval_cache)))
+                    self._eval_cache[fen] = suggestions
+                    if self._eval_shelf is not None:
+                        self._eval_shelf[fen] = suggestions
+            Logger.success("Analysis prefetch completed")
+        except Exception as e:
+            Logger.warning(f"Analysis prefetch failed: {e}")
+
     def analyze_position(self, board):
         """Get computer recommendations for the current position."""
         if not self.stockfish:
             Logger.debug("Skipping position analysis - Stockfish not available")
             return None
-            
+
         try:
+            # Serve repeat positions from the cache
+            cache_key = board.fen()
+            suggestions = self._eval_cache.get(cache_key)
+            if suggestions is None and self._eval_shelf is not None:
+                suggestions = self._eval_shelf.get(cache_key)
+            if suggestions is not None:
+                Logger.debug("Analysis served from cache")
+                return suggestions
+
             Logger.debug("Analyzing position...")
-            
-            # Set position in Stockfish
-            fen = board.fen()
-            self.stockfish.set_fen_position(fen)
-            
+
             # Get suggestions for both sides
             suggestions = {'white': None, 'black': None}
-            
-            # Get current side's best moves
-            current_analysis = self.stockfish.get_top_moves(3)  # Get top 3 moves
-            if current_analysis:
-                side_to_move = 'white' if board.turn == chess.WHITE else 'black'
-                best_move = current_analysis[0]
-                move_uci = best_move['Move']
-                move = chess.Move.from_uci(move_uci)
-                
-                # Get evaluation
-                eval_score = best_move.get('Centipawn')
-                mate_in = best_move.get('Mate')
-                
-                # Format evaluation text
-                if mate_in is not None:
-                    eval_text = f"Mate in {mate_in}"
-                else:
-                    eval_text = f"{eval_score/100:.1f}" if eval_score is not None else "?"
-                
-                # Get move reasoning and consequences
-                reasoning = self.get_move_reasoning(board, move)
-                consequences = self.analyze_move_consequences(board, move)
-                
-                suggestions[side_to_move] = {
-                    'move': move_uci,
-                    'score': eval_score,
-                    'mate': mate_in,
-                    'text': f"Best move: {move_uci} ({eval_text})",
-                    'reasoning': reasoning,
-                    'consequences': consequences,
-                    'alternatives': [
-                        {
-                            'move': m['Move'],
-                            'score': m.get('Centipawn'),
-                            'mate': m.get('Mate'),
-                            'reasoning': self.get_move_reasoning(board, chess.Move.from_uci(m['Move'])),
-                            'consequences': self.analyze_move_consequences(board, chess.Move.from_uci(m['Move']))
-                        } for m in current_analysis[1:3]  # Get next 2 best moves
-                    ]
-                }
-            
+            side_to_move = 'white' if board.turn == chess.WHITE else 'black'
+            other_side = 'black' if side_to_move == 'white' else 'white'
+
+            # Hand the off-turn side (via a null move) to the second engine
+            # so both analyses run in parallel
+            other_future = None
+            if self.stockfish_b and not board.is_check():
+                null_board = board.copy(stack=False)
+                null_board.push(chess.Move.null())
+                other_future = self._side_pool.submit(
+                    self._get_side_suggestion, self.stockfish_b, null_board)
+
+            suggestions[side_to_move] = self._get_side_suggestion(self.stockfish, board,
+                                                                  fen=cache_key)
+            if other_future:
+                suggestions[other_side] = other_future.result()
+
+            # Remember the verdict for this position
+            if len(self._eval_cache) >= self._eval_cache_max:
+                self._eval_cache.pop(next(iter(self._eval_cache)))
+            self._eval_cache[cache_key] = suggestions
+            if self._eval_shelf is not None:
+                self._eval_shelf[cache_key] = suggestions
+
             Logger.debug(f"Analysis complete: {suggestions}")
             return suggestions
-            
+
         except Exception as e:
             Logger.error(f"Error in position analysis: {e}")
             return None
         
     def get_opening_name(self, board):
-        """Get the name of the opening based on the current position using Stockfish."""
-        move_count = len(board.move_stack) // 2  # Convert half-moves to full moves
+        """Get the name of the opening by walking the opening trie incrementally."""
+        move_count = self._halfmoves >> 1  # Convert half-moves to full moves
         if move_count > 15:  # Stop checking after move 15
             self.state['current_opening'] = None  # Clear opening name after move 15
             return None
-            
-        if not self.stockfish:
-            return None
-            
+
         try:
-            # Set position in Stockfish
-            fen = board.fen()
-            self.stockfish.set_fen_position(fen)
-            
-            # Get book moves and evaluation
-            book_moves = self.stockfish.get_top_moves(5)  # Get top 5 book moves
-            if not book_moves:
-                return None
-                
-            # Get current move sequence
-            moves = [move.uci() for move in board.move_stack]
-            moves_str = " ".join(moves)
-            
-            # Common openings and their move patterns
-            openings = {
-                # Main lines
-                "e2e4 e7e5": {
-                    "name": "Open Game",
-                    "variations": {
-                        "g1f3 b8c6 f1b5": "Ruy Lopez",
-                        "g1f3 b8c6 f1c4": "Italian Game",
-                        "g1f3 b8c6 d2d4": "Scotch Game",
-                        "f2f4": "King's Gambit",
-                        "d2d4 e5d4": "Center Game"
-                    }
-                },
-                "e2e4 c7c5": {
-                    "name": "Sicilian Defense",
-                    "variations": {
-                        "g1f3 d7d6": "Sicilian Najdorf",
-                        "g1f3 b8c6": "Sicilian Open",
-                        "b1c3": "Sicilian Closed",
-                        "c2c3": "Sicilian Alapin"
-                    }
-                },
-                "e2e4 e7e6": {
-                    "name": "French Defense",
-                    "variations": {
-                        "d2d4 d7d5": "French Main Line",
-                        "d2d4 d7d5 e4e5": "French Advance",
-                        "d2d4 d7d5 e4d5": "French Exchange"
-                    }
-                },
-                "d2d4 d7d5": {
-                    "name": "Queen's Pawn Game",
-                    "variations": {
-                        "c2c4": "Queen's Gambit",
-                        "c2c4 d5c4": "Queen's Gambit Accepted",
-                        "c2c4 e7e6": "Queen's Gambit Declined",
-                        "g1f3 g8f6 c2c4": "Queen's Gambit Orthodox"
-                    }
-                },
-                "d2d4 g8f6": {
-                    "name": "Indian Defense",
-                    "variations": {
-                        "c2c4 e7e6 g1f3": "Nimzo-Indian Defense",
-                        "c2c4 g7g6": "King's Indian Defense",
-                        "c2c4 e7e6 g1f3 b7b6": "Queen's Indian Defense"
-                    }
-                }
-            }
-            
-            # Find matching opening
-            opening_name = None
-            variation_name = None
-            
-            for pattern, data in openings.items():
-                if moves_str.startswith(pattern):
-                    opening_name = data["name"]
-                    # Check for variations
-                    for var_pattern, var_name in data.get("variations", {}).items():
-                        if moves_str.startswith(pattern + " " + var_pattern):
-                            variation_name = var_name
-                            break
+            # Consume only the moves played since the last lookup
+            while (self._opening_node is not None and
+                   self._opening_ply < len(board.move_stack)):
+                played = board.move_stack[self._opening_ply]
+                self._opening_ply += 1
+                entry = self._opening_node.get(played)
+                if entry is None:
+                    # Out of book - keep the last matched name
+                    self._opening_node = None
                     break
-            
-            if variation_name:
-                return variation_name
-            return opening_name
-            
+                if entry[0]:
+                    self._opening_name = entry[0]
+                self._opening_node = entry[1]
+
+            return self._opening_name
+
         except Exception as e:
             Logger.error(f"Error getting opening name: {e}")
             return None
 
     def analyze_position_strength(self, board, move):
         """Analyze the strength of a position and move."""
-        # Center control
-        center_squares = {chess.E4, chess.E5, chess.D4, chess.D5}
+        # Center control: count attacks on the four center squares
         center_control = 0
-        for square in center_squares:
-            if board.is_attacked_by(chess.WHITE, square):
+        for square in (chess.E4, chess.E5, chess.D4, chess.D5):
+            if board.attackers_mask(chess.WHITE, square):
                 center_control += 1
-            if board.is_attacked_by(chess.BLACK, square):
+            if board.attackers_mask(chess.BLACK, square):
                 center_control -= 1
-        
-        # Development
-        developed_pieces = 0
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece:
-                # Count developed minor pieces
-                if piece.piece_type in [chess.KNIGHT, chess.BISHOP]:
-                    if piece.color == chess.WHITE and square > chess.H2:
-                        developed_pieces += 1
-                    elif piece.color == chess.BLACK and square < chess.H7:
-                        developed_pieces -= 1
-        
+
+        # Development: minor pieces off their back two ranks, via bitboards
+        minors = board.knights | board.bishops
+        developed_w = minors & board.occupied_co[chess.WHITE] & ~(chess.BB_RANK_1 | chess.BB_RANK_2)
+        developed_b = minors & board.occupied_co[chess.BLACK] & ~(chess.BB_RANK_7 | chess.BB_RANK_8)
+        developed_pieces = popcount(developed_w) - popcount(developed_b)
+
         # King safety (based on castling rights instead of castled status)
         king_safety = 0
         if board.has_kingside_castling_rights(chess.WHITE) or board.has_queenside_castling_rights(chess.WHITE):
@@ -746,34 +1270,44 @@ class ChessCommentator:
         """Suggest legal moves based on the current position."""
         suggestions = []
         
+        # Generate the legal moves once; every `in board.legal_moves` test
+        # re-runs the whole generator
+        legal_moves = list(board.legal_moves)
+        legal_set = set(legal_moves)
+
         # Only suggest castling if it's actually legal this turn
-        if board.turn == chess.WHITE:
-            if chess.Move.from_uci('e1g1') in board.legal_moves:
-                suggestions.append("Kingside castling is available")
-            if chess.Move.from_uci('e1c1') in board.legal_moves:
-                suggestions.append("Queenside castling is available")
+        kingside, queenside = _CASTLING_MOVES[board.turn]
+        if kingside in legal_set:
+            suggestions.append("Kingside castling is available")
+        if queenside in legal_set:
+            suggestions.append("Queenside castling is available")
+
+        # Check for tactical opportunities. Scan captures first, most
+        # valuable victim first, so the 2-suggestion budget is filled after
+        # a handful of moves instead of walking the whole move list
+        piece_map = board.piece_map()  # one lookup table instead of piece_at per move
+        captures = [m for m in legal_moves if board.is_capture(m)]
+        if captures:
+            captures.sort(
+                key=lambda m: self.PIECE_VALUES.get(board.piece_type_at(m.to_square), 0),
+                reverse=True)
+            capture_set = set(captures)
+            ordered_moves = captures + [m for m in legal_moves if m not in capture_set]
         else:
-            if chess.Move.from_uci('e8g8') in board.legal_moves:
-                suggestions.append("Kingside castling is available")
-            if chess.Move.from_uci('e8c8') in board.legal_moves:
-                suggestions.append("Queenside castling is available")
-        
-        # Check for tactical opportunities
-        for move in board.legal_moves:
+            ordered_moves = legal_moves
+        for move in ordered_moves:
             # Check for captures
             if board.is_capture(move):
-                captured_piece = board.piece_at(move.to_square)
+                captured_piece = piece_map.get(move.to_square)
                 if captured_piece:
-                    attacker = board.piece_at(move.from_square)
+                    attacker = piece_map[move.from_square]
                     if captured_piece.piece_type >= attacker.piece_type:
-                        suggestions.append(f"Can capture {self.piece_names[str(captured_piece).lower()]} on {chess.square_name(move.to_square)}")
-            
-            # Check for checks
-            board.push(move)
-            if board.is_check():
-                suggestions.append(f"Check available with {self.piece_names[str(board.piece_at(move.to_square))]} to {chess.square_name(move.to_square)}")
-            board.pop()
-            
+                        suggestions.append(f"Can capture {self.piece_names[captured_piece.piece_type]} on {chess.square_name(move.to_square)}")
+
+            # Check for checks without mutating the board
+            if board.gives_check(move):
+                suggestions.append(f"Check available with {self.piece_names[piece_map[move.from_square].piece_type]} to {chess.square_name(move.to_square)}")
+
             if len(suggestions) >= 2:  # Limit to 2 tactical suggestions
                 break
         
@@ -783,76 +1317,58 @@ class ChessCommentator:
         """Identify common checkmate patterns."""
         if not board.is_checkmate():
             return None
-            
-        # Get the pieces involved in the checkmate
+
+        winner = not board.turn  # the side to move is the mated side
+        to_piece = board.piece_at(move.to_square)
+        to_type = to_piece.piece_type if to_piece else None
+
+        # Check special patterns first; the guard above already established
+        # checkmate, so none of them re-test it
+        if len(board.move_stack) <= 4 and move in _FOOLS_MATE_MOVES:
+            return "Fool's Mate"
+        if (len(board.move_stack) <= 8 and
+                not _SCHOLARS_MATE_MOVES.isdisjoint(board.move_stack)):
+            return "Scholar's Mate"
+        if (to_type in [chess.QUEEN, chess.ROOK] and
+                move.to_square in [chess.H1, chess.H8]):
+            return "Back Rank Mate"
+        if to_type == chess.KNIGHT:
+            if all(board.piece_at(sq) for sq in board.attacks(move.to_square)):
+                return "Smothered Mate"
+            if any(board.piece_at(sq) and board.piece_at(sq).piece_type == chess.ROOK
+                   for sq in board.attacks(board.king(board.turn))):
+                return "Arabian Mate"
+
+        # Basic piece combinations: piece types of the winner's pieces
+        # attacking the mated king, read straight off the bitboards
+        attackers_bb = board.attackers_mask(winner, board.king(board.turn))
         attacking_pieces = []
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece and piece.color == board.turn:
-                if board.is_attacked_by(board.turn, square):
-                    attacking_pieces.append(piece.piece_type)
-        
-        # Sort pieces for consistent pattern matching
+        for piece_bb, piece_type in ((board.pawns, chess.PAWN),
+                                     (board.knights, chess.KNIGHT),
+                                     (board.bishops, chess.BISHOP),
+                                     (board.rooks, chess.ROOK),
+                                     (board.queens, chess.QUEEN)):
+            attacking_pieces.extend([piece_type] * popcount(attackers_bb & piece_bb))
         attacking_pieces.sort()
-        
-        # Define checkmate patterns
-        patterns = {
-            # Basic mates
-            (chess.QUEEN,): "Queen Checkmate",
-            (chess.ROOK,): "Rook Checkmate",
-            (chess.ROOK, chess.ROOK): "Two-Rook Checkmate",
-            (chess.BISHOP, chess.BISHOP): "Two-Bishop Checkmate",
-            (chess.BISHOP, chess.KNIGHT): "Bishop and Knight Checkmate",
-            
-            # Special patterns
-            "Fool's Mate": lambda: len(board.move_stack) <= 4 and 
-                          str(move) in ['f2f4', 'g2g4'] and 
-                          board.is_checkmate(),
-            
-            "Scholar's Mate": lambda: len(board.move_stack) <= 8 and 
-                            any(str(m) in ['f1c4', 'd1h5', 'd1f3'] for m in board.move_stack) and 
-                            board.is_checkmate(),
-            
-            "Back Rank Mate": lambda: board.piece_at(move.to_square).piece_type in [chess.QUEEN, chess.ROOK] and 
-                             move.to_square in [chess.H1, chess.H8] and 
-                             board.is_checkmate(),
-            
-            "Smothered Mate": lambda: board.piece_at(move.to_square).piece_type == chess.KNIGHT and 
-                             board.is_checkmate() and 
-                             all(board.piece_at(sq) for sq in board.attacks(move.to_square)),
-            
-            "Arabian Mate": lambda: board.piece_at(move.to_square).piece_type == chess.KNIGHT and 
-                          board.is_checkmate() and 
-                          any(board.piece_at(sq) and board.piece_at(sq).piece_type == chess.ROOK 
-                              for sq in board.attacks(board.king(not board.turn)))
-        }
-        
-        # Check special patterns first
-        for pattern_name, check_pattern in patterns.items():
-            if isinstance(check_pattern, type(lambda: None)):
-                if check_pattern():
-                    return pattern_name
-        
-        # Check basic piece combination patterns
-        attacking_pieces = tuple(attacking_pieces)
-        if attacking_pieces in patterns:
-            return patterns[attacking_pieces]
-        
-        return "Checkmate"  # Default if no specific pattern is identified
+
+        # Default if no specific pattern is identified
+        return _MATE_PATTERN_TABLE.get(tuple(attacking_pieces), "Checkmate")
 
     def generate_commentary(self, board, move, analysis):
         try:
             Logger.debug(f"Generating commentary for move: {move}")
+            # Probe the moved/captured pieces once and reuse them below
             piece_moved = board.piece_at(move.from_square)
+            captured_piece = board.piece_at(move.to_square)
             is_capture = board.is_capture(move)
-            
+
             # Before making the move
-            self.update_captured_pieces(board, move)
+            self.update_captured_pieces(board, move, captured_piece)
             
             # Basic move description (always included in audio)
-            piece_name = self.piece_names.get(str(piece_moved), "Piece")
+            piece_name = self.piece_names.get(piece_moved.piece_type, "piece")
             side_color = "White" if piece_moved.color == chess.WHITE else "Black"
-            commentary = f"{side_color} {piece_name.lower()} moves from {chess.square_name(move.from_square)} "
+            commentary = f"{side_color} {piece_name} moves from {chess.square_name(move.from_square)} "
             commentary += f"to {chess.square_name(move.to_square)}"
             
             # Store move squares for arrow drawing
@@ -860,13 +1376,12 @@ class ChessCommentator:
             self.last_move_to = move.to_square
             
             # Add capture details (always included in audio)
-            if is_capture:
-                captured_piece = board.piece_at(move.to_square)
-                if captured_piece:
-                    commentary += f" capturing the {self.piece_names[str(captured_piece).lower()]}"
+            if is_capture and captured_piece:
+                commentary += f" capturing the {self.piece_names[captured_piece.piece_type]}"
             
             # Make the move to analyze the resulting position
             board.push(move)
+            self._halfmoves += 1
             
             # Get opening name
             opening_name = self.get_opening_name(board)
@@ -928,84 +1443,202 @@ class ChessCommentator:
 
     def get_move_reasoning(self, board, move):
         """Generate reasoning for why a move is good."""
+        cache_key = (board.board_fen(), board.turn, move.uci())
+        cached = self._reasoning_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         reasons = []
         
         # Check if move captures a piece
         if board.is_capture(move):
             captured_piece = board.piece_at(move.to_square)
             if captured_piece:
-                reasons.append(f"captures {self.piece_names[str(captured_piece).lower()]}")
+                reasons.append(f"captures {self.piece_names[captured_piece.piece_type]}")
         
-        # Check if move gives check
-        board.push(move)
-        if board.is_check():
+        # Check if move gives check (no make/unmake needed)
+        if board.gives_check(move):
             reasons.append("gives check")
-        
+
+        to_bb = chess.BB_SQUARES[move.to_square]
+
         # Check if move controls center
-        center_squares = {chess.E4, chess.E5, chess.D4, chess.D5}
-        if move.to_square in center_squares:
+        if to_bb & _CENTER_BB:
             reasons.append("controls center")
-        
-        # Check if move develops a piece
-        piece = board.piece_at(move.to_square)
-        if piece and piece.piece_type in [chess.KNIGHT, chess.BISHOP]:
-            if piece.color == chess.WHITE and move.to_square > chess.H2:
-                reasons.append("develops piece")
-            elif piece.color == chess.BLACK and move.to_square < chess.H7:
+
+        # Check if move develops a piece (read the mover before the move)
+        piece = board.piece_at(move.from_square)
+        if piece and piece.piece_type in (chess.KNIGHT, chess.BISHOP):
+            devel_bb = _DEVEL_WHITE_BB if piece.color == chess.WHITE else _DEVEL_BLACK_BB
+            if to_bb & devel_bb:
                 reasons.append("develops piece")
-        
-        board.pop()
-        
-        return ", ".join(reasons) if reasons else "improves position"
+
+        reasoning = ", ".join(reasons) if reasons else "improves position"
+        if len(self._reasoning_cache) >= self._reasoning_cache_max:
+            self._reasoning_cache.pop(next(iter(self._reasoning_cache)))
+        self._reasoning_cache[cache_key] = reasoning
+        return reasoning
 
     def analyze_move_consequences(self, board, move):
         """Analyze what a move achieves or prevents."""
         consequences = []
-        
-        # Make the move on a copy of the board
-        board_copy = board.copy()
-        board_copy.push(move)
-        
-        # Check for immediate tactical consequences
-        if board_copy.is_check():
-            consequences.append("Gives check")
-        if board_copy.is_checkmate():
-            consequences.append("Checkmate!")
-        if board_copy.is_stalemate():
-            consequences.append("Forces stalemate")
-            
-        # Check for piece safety
+
+        # Read the mover before simulating, then push/pop in place: a full
+        # board.copy() clones every bitboard and the move stack per call
         piece_moved = board.piece_at(move.from_square)
-        if piece_moved:
-            # Is the piece protected after the move?
-            if board_copy.is_attacked_by(piece_moved.color, move.to_square):
-                consequences.append("Piece remains protected")
-            # Is it under attack?
-            if board_copy.is_attacked_by(not piece_moved.color, move.to_square):
-                consequences.append("Piece will be under attack")
-                
-        # Check for control of key squares
-        center_squares = {chess.E4, chess.E5, chess.D4, chess.D5}
-        if move.to_square in center_squares:
-            consequences.append("Controls central square")
-            
-        # Check for piece coordination
-        attacks = board_copy.attacks(move.to_square)
-        if len(list(attacks)) > 2:
-            consequences.append("Improves piece coordination")
-            
-        # Check for pawn structure impact
-        if piece_moved and piece_moved.piece_type == chess.PAWN:
-            if move.to_square >= 56 or move.to_square <= 7:  # Promotion
-                consequences.append("Leads to pawn promotion")
-            elif not any(board_copy.piece_at(sq) and 
-                       board_copy.piece_at(sq).piece_type == chess.PAWN and
-                       board_copy.piece_at(sq).color == piece_moved.color
-                       for sq in board_copy.attacks(move.to_square)):
-                consequences.append("Creates isolated pawn")
-                
+        board.push(move)
+        try:
+            # Check for immediate tactical consequences
+            if board.is_check():
+                consequences.append("Gives check")
+            if board.is_checkmate():
+                consequences.append("Checkmate!")
+            if board.is_stalemate():
+                consequences.append("Forces stalemate")
+
+            # Check for piece safety: read both sides' attackers of the
+            # landing square in one pass each instead of two is_attacked_by
+            # probes
+            if piece_moved:
+                if board.attackers_mask(piece_moved.color, move.to_square):
+                    consequences.append("Piece remains protected")
+                if board.attackers_mask(not piece_moved.color, move.to_square):
+                    consequences.append("Piece will be under attack")
+
+            # Check for control of key squares
+            to_bb = chess.BB_SQUARES[move.to_square]
+            if to_bb & _CENTER_BB:
+                consequences.append("Controls central square")
+
+            # Check for piece coordination: the attack set is queried once
+            # as a mask and shared with the pawn-structure scan below
+            attacks_bb = board.attacks_mask(move.to_square)
+            if popcount(attacks_bb) > 2:
+                consequences.append("Improves piece coordination")
+
+            # Check for pawn structure impact
+            if piece_moved and piece_moved.piece_type == chess.PAWN:
+                if to_bb & (chess.BB_RANK_1 | chess.BB_RANK_8):  # Promotion
+                    consequences.append("Leads to pawn promotion")
+                else:
+                    own_pawns = board.pawns & board.occupied_co[piece_moved.color]
+                    if not attacks_bb & own_pawns:
+                        consequences.append("Creates isolated pawn")
+        finally:
+            board.pop()
+
         return consequences
 
+    def _frame_writer_loop(self, frame_q):
+        """Drain the frame queue, encoding surfaces to PNG off the hot path.
+
+        Runs on a dedicated writer thread; a None sentinel ends the loop.
+        """
+        while True:
+            item = frame_q.get()
+            if item is None:
+                break
+            surface, path = item
+            try:
+                pygame.image.save(surface, path)
+            except Exception as e:
+                Logger.error(f"Error saving frame {path}: {e}")
+
+    def _build_audio_track(self, total_duration, out_path):
+        """Assemble all commentary clips into one silence-padded WAV.
+
+        Muxing N separate clips costs N demuxers and an N-input amix
+        graph; instead each clip is placed at its start offset in a
+        single zeroed buffer, giving ffmpeg one audio input and a
+        trivial copy mux. Returns None (the caller falls back to the
+        per-clip filter graph) when soundfile is missing, sample rates
+        disagree, or any clip fails to decode.
+        """
+        if sf is None or not self.audio_segments:
+            return None
+        try:
+            clips = []
+            samplerate = None
+            for audio_file, start_time in self.audio_segments:
+                if not os.path.exists(audio_file):
+                    Logger.warning(f"Missing audio segment: {audio_file}")
+                    continue
+                data, rate = sf.read(audio_file, dtype='float32', always_2d=True)
+                if samplerate is None:
+                    samplerate = rate
+                elif rate != samplerate:
+                    Logger.warning("Mixed TTS sample rates - using filter-graph mux")
+                    return None
+                clips.append((data, start_time))
+            if not clips:
+                return None
+
+            # Pad one second past the video so -shortest never clips frames
+            channels = clips[0][0].shape[1]
+            full = np.zeros((int((total_duration + 1.0) * samplerate), channels),
+                            dtype=np.float32)
+            for data, start_time in clips:
+                begin = int(start_time * samplerate)
+                end = min(begin + len(data), len(full))
+                full[begin:end] = data[:end - begin, :channels]
+            sf.write(out_path, full, samplerate)
+            return out_path
+        except Exception as e:
+            Logger.warning(f"Batched audio assembly failed: {e}")
+            return None
+
+    def _ffmpeg_path(self):
+        """Locate the ffmpeg binary, resolved once per instance.
+
+        Prefers a system install, falling back to the copy bundled with
+        imageio-ffmpeg (which moviepy already pulls in), so machines
+        without ffmpeg on PATH keep working.
+        """
+        if self._ffmpeg_exe is None:
+            exe = shutil.which("ffmpeg")
+            if exe is None:
+                try:
+                    import imageio_ffmpeg
+                    exe = imageio_ffmpeg.get_ffmpeg_exe()
+                except Exception as e:
+                    Logger.warning(f"No system ffmpeg and imageio-ffmpeg unavailable: {e}")
+                    exe = "ffmpeg"
+            self._ffmpeg_exe = exe
+        return self._ffmpeg_exe
+
+    def _pick_encoder(self):
+        """Choose the fastest available ffmpeg video encoder, probed once.
+
+        Prefers NVENC when a capable GPU build is present, then SVT-AV1,
+        then plain libx264. All variants keep the fixed 1s GOP / no
+        B-frame profile the mux stage relies on.
+        """
+        if self._encoder_args is not None:
+            return self._encoder_args
+
+        available = ""
+        try:
+            result = subprocess.run([self._ffmpeg_path(), "-hide_banner", "-encoders"],
+                                    capture_output=True, text=True)
+            available = result.stdout
+        except Exception as e:
+            Logger.warning(f"Could not probe ffmpeg encoders: {e}")
+
+        if "h264_nvenc" in available:
+            self._encoder_args = ["-c:v", "h264_nvenc", "-qp", "23",
+                                  "-g", "30", "-bf", "0"]
+        elif "libsvtav1" in available:
+            self._encoder_args = ["-c:v", "libsvtav1", "-preset", "12",
+                                  "-crf", "40", "-g", "30"]
+        else:
+            self._encoder_args = ["-c:v", "libx264", "-preset", "veryfast",
+                                  "-g", "30", "-bf", "0",
+                                  "-x264-params", "keyint=30:min-keyint=30:scenecut=0"]
+        # Let the codec fan out across every core
+        self._encoder_args += ["-threads", "0"]
+        Logger.info(f"Using video encoder: {self._encoder_args[1]}")
+        return self._encoder_args
+
     def create_video(self, pgn_path, output_path, min_delay_seconds=3):
         game = self.load_pgn(pgn_path)
         if not game:
@@ -1013,34 +1646,47 @@ class ChessCommentator:
             
         try:
             Logger.info("Starting video creation...")
-            self.board = game.board()  # Store the board as class attribute
-            fps = 30
+            self._reset_game_state()
+
+            # Batch the whole game's speech synthesis up front: gTTS
+            # synthesizes concurrently, pyttsx3 drains its event loop once
+            # for the whole game instead of once per move
+            if self.tts_backend:
+                self._prefetch_commentary_audio()
+                self._reset_game_state()
+
+            # Run the engine over the whole game first so the per-move
+            # analyze_position calls below are all cache hits
+            self._prefetch_analysis(game)
+
             temp_video_path = "output/temp_video.mp4"
-            
-            # Create video writer for the full window size
-            Logger.debug("Initializing video writer...")
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            video = cv2.VideoWriter(temp_video_path, fourcc, fps, 
-                                  (self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
-            
+            frames_dir = "output/frames"
+            os.makedirs(frames_dir, exist_ok=True)
+
+            # Each unique position is saved once as a PNG; the concat
+            # demuxer later repeats it for its hold duration, so the encoder
+            # never sees a duplicated frame
+            frame_entries = []  # (png_path, seconds)
+            frame_index = 0
+
+            # Final pipeline stage: PNG encoding runs on a writer thread fed
+            # by a bounded queue, so the main loop moves on to the next
+            # move's commentary/analysis while the frame is compressed.
+            # maxsize caps the number of surface copies held in memory.
+            frame_q = queue.Queue(maxsize=4)
+            writer = threading.Thread(target=self._frame_writer_loop,
+                                      args=(frame_q,), daemon=True)
+            writer.start()
+
             self.current_move = 0
             self.audio_segments = []
             current_time = 0
             
             clock = pygame.time.Clock()
             running = True
-            
-            # Reset player scores and notable moves
-            self.player_scores = {'white': 100, 'black': 100}
-            self.notable_moves = {
-                'blunders': {'white': [], 'black': []},
-                'mistakes': {'white': [], 'black': []},
-                'good_moves': {'white': [], 'black': []},
-                'missed_wins': {'white': [], 'black': []}
-            }
-            
+
             Logger.info("Processing moves...")
-            for move in game.mainline_moves():
+            for move in self._mainline:
                 if not running:
                     Logger.warning("Video creation interrupted")
                     break
@@ -1049,12 +1695,40 @@ class ChessCommentator:
                 self.status_message = f"Processing move {self.current_move}/{self.total_moves}"
                 Logger.info(f"Processing move {self.current_move}/{self.total_moves}: {move}")
                 
+                # Generate commentary up front and start speech synthesis in
+                # the background: the spoken text depends only on the move,
+                # so it can overlap the engine search and hold-frame encode
+                commentary = self.generate_commentary(self.board, move, None)
+                tts_future = None
+                if self.tts_backend:
+                    Logger.debug(f"Generating audio for move {self.current_move}")
+                    tts_future = self._tts_pool.submit(self._synthesize_speech, commentary)
+
                 # Get computer recommendations BEFORE the move is made
                 if self.stockfish:
                     Logger.debug("Getting computer recommendations...")
-                    analysis = self.analyze_position(self.board)
+                    # Submit to the worker thread so the engine thinks while
+                    # the hold frames below are rendered and encoded
+                    analysis_future = self._analysis_pool.submit(
+                        self.analyze_position, self.board.copy())
+                    self.computer_suggestions = {'white': None, 'black': None}
+                    self._dirty = True
+
+                    # Draw the current position while the engine thinks
+                    self.render_frame("Computer analyzing position...")
+
+                    # Hold the "analyzing" frame for one second
+                    frame_index += 1
+                    frame_path = os.path.join(frames_dir, f"frame_{frame_index:05d}.png")
+                    frame_q.put((self.canvas.copy(), frame_path))
+                    frame_entries.append((frame_path, 1.0))
+                    current_time += 1
+
+                    # Collect the engine's verdict
+                    analysis = analysis_future.result()
                     self.computer_suggestions = analysis
-                    
+                    self._dirty = True
+
                     # Analyze move quality
                     if analysis:
                         side = 'white' if self.board.turn == chess.WHITE else 'black'
@@ -1085,143 +1759,169 @@ class ChessCommentator:
                                         'evaluation': score/100
                                     })
                                     self.player_scores[side] = min(100, self.player_scores[side] + 5)
-                    
-                    # Draw the current position with recommendations
-                    self.window.fill(self.BG_COLOR)
-                    self.draw_board()
-                    self.draw_pieces(self.board)
-                    self.draw_info_panel("Computer analyzing position...")
-                    pygame.display.flip()
-                    
-                    # Add a short delay to show recommendations
-                    frames_for_analysis = int(1 * fps)  # 1 second to show recommendations
-                    window_string = pygame.image.tostring(self.window, 'RGB')
-                    frame = np.frombuffer(window_string, dtype=np.uint8)
-                    frame = frame.reshape((self.WINDOW_HEIGHT, self.WINDOW_WIDTH, 3))
-                    for _ in range(frames_for_analysis):
-                        video.write(frame)
-                    current_time += 1
-                
-                # Handle pygame events
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        Logger.warning("User closed the window")
-                        running = False
-                        break
-                    elif event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_ESCAPE:
-                            Logger.warning("User pressed ESC")
+
+                # Handle pygame events (interactive runs only; pumping the
+                # queue and honoring ESC/QUIT throttles batch rendering)
+                if self.interactive:
+                    for event in pygame.event.get():
+                        if event.type == pygame.QUIT:
+                            Logger.warning("User closed the window")
                             running = False
                             break
+                        elif event.type == pygame.KEYDOWN:
+                            if event.key == pygame.K_ESCAPE:
+                                Logger.warning("User pressed ESC")
+                                running = False
+                                break
                 
-                # Generate commentary and save audio
-                commentary = self.generate_commentary(self.board, move, self.computer_suggestions)
-                audio_file = f"temp_audio_{self.current_move}.mp3"
-                
-                # Get audio duration
+                # Collect the audio synthesized in the background
                 audio_duration = min_delay_seconds  # Default minimum duration
-                if self.tts_engine:
+                if tts_future is not None:
                     try:
-                        Logger.debug(f"Generating audio for move {self.current_move}")
-                        self.tts_engine.save_to_file(commentary, audio_file)
-                        self.tts_engine.runAndWait()
-                        # Get actual audio duration
-                        temp_audio = AudioFileClip(audio_file)
-                        audio_duration = max(min_delay_seconds, temp_audio.duration + 0.5)  # Add 0.5s buffer
-                        temp_audio.close()
+                        audio_file = tts_future.result()
+                        # Get actual audio duration from the file header;
+                        # AudioFileClip spawns an ffmpeg pipe and decodes
+                        # the whole clip just to measure it
+                        if sf is not None:
+                            clip_seconds = sf.info(audio_file).duration
+                        else:
+                            temp_audio = AudioFileClip(audio_file)
+                            clip_seconds = temp_audio.duration
+                            temp_audio.close()
+                        audio_duration = max(min_delay_seconds, clip_seconds + 0.5)  # Add 0.5s buffer
                         self.audio_segments.append((audio_file, current_time))
                     except Exception as e:
                         Logger.error(f"TTS error: {e}")
                 
-                # Make the move
+                # Keep the incremental draw map in sync, then make the move
+                self._apply_move_to_positions(self.board, move)
                 self.board.push(move)
-                
-                # Clear the window
-                self.window.fill(self.BG_COLOR)
-                
-                # Draw board and pieces
-                self.draw_board()
-                self.draw_pieces(self.board)
-                
-                # Draw info panel
-                self.draw_info_panel(commentary)
-                
-                # Update the display
-                pygame.display.flip()
-                
-                # Convert pygame window to video frame
-                window_string = pygame.image.tostring(self.window, 'RGB')
-                frame = np.frombuffer(window_string, dtype=np.uint8)
-                frame = frame.reshape((self.WINDOW_HEIGHT, self.WINDOW_WIDTH, 3))
-                
-                # Write frames based on audio duration
-                frames_per_position = int(audio_duration * fps)
-                Logger.debug(f"Writing {frames_per_position} frames for move {self.current_move} (duration: {audio_duration:.2f}s)")
-                for _ in range(frames_per_position):
-                    video.write(frame)
-                
+                self._dirty = True
+
+                # Redraw with the move played and its commentary
+                self.render_frame(commentary)
+
+                # Save this position once; it is held for the audio duration
+                frame_index += 1
+                frame_path = os.path.join(frames_dir, f"frame_{frame_index:05d}.png")
+                frame_q.put((self.canvas.copy(), frame_path))
+                frame_entries.append((frame_path, audio_duration))
+                Logger.debug(f"Captured frame for move {self.current_move} (hold: {audio_duration:.2f}s)")
+
                 current_time += audio_duration
-                clock.tick(60)
-                
-            video.release()
+                if self.interactive:
+                    clock.tick(60)
+
+            # All frames must be on disk before ffmpeg reads the manifest
+            frame_q.put(None)
+            writer.join()
+
+            # Assemble the temp video: every unique frame is encoded exactly
+            # once and stretched to its hold time by the concat demuxer
+            Logger.info("Encoding base video with ffmpeg...")
+            concat_path = os.path.join(frames_dir, "concat.txt")
+            with open(concat_path, "w") as concat_file:
+                for frame_path, duration in frame_entries:
+                    concat_file.write(f"file '{os.path.basename(frame_path)}'\n")
+                    concat_file.write(f"duration {duration:.3f}\n")
+                if frame_entries:
+                    # The demuxer ignores the last duration unless the final
+                    # file is listed again
+                    concat_file.write(f"file '{os.path.basename(frame_entries[-1][0])}'\n")
+
+            # Fixed 1s GOP, no B-frames: every held frame starts on a
+            # keyframe, so the later stream-copy mux never has to seek
+            # into an open GOP
+            subprocess.run([
+                self._ffmpeg_path(), "-y", "-f", "concat", "-safe", "0", "-i", concat_path,
+                "-vsync", "vfr", *self._pick_encoder(),
+                "-pix_fmt", "yuv420p", temp_video_path
+            ], check=True, capture_output=True)
             Logger.success("Base video creation completed")
             
-            # Combine video with audio
-            if self.audio_segments:
-                Logger.info("Combining video with audio...")
-                video_clip = VideoFileClip(temp_video_path)
-                audio_clips = []
-                
-                for audio_file, start_time in self.audio_segments:
-                    if os.path.exists(audio_file):
-                        Logger.debug(f"Processing audio segment: {audio_file}")
-                        try:
-                            audio_clip = AudioFileClip(audio_file)
-                            audio_clips.append(audio_clip.set_start(start_time))
-                            os.remove(audio_file)
-                        except Exception as e:
-                            Logger.warning(f"Failed to process audio clip {audio_file}: {e}")
-                
-                if audio_clips:
-                    try:
-                        Logger.debug("Creating final video with audio...")
-                        # Combine all audio clips
-                        from moviepy.audio.AudioClip import CompositeAudioClip
-                        final_audio = CompositeAudioClip(audio_clips)
-                        # Set the audio to the video
-                        final_video = video_clip.set_audio(final_audio)
-                        # Write the final video
-                        final_video.write_videofile(output_path, audio_codec='aac')
-                        # Close all clips
-                        final_audio.close()
-                        for clip in audio_clips:
-                            clip.close()
-                    except Exception as e:
-                        Logger.error(f"Error combining audio: {e}")
-                        # If audio fails, just save the video without audio
-                        Logger.warning("Saving video without audio due to error")
-                        video_clip.write_videofile(output_path)
-                
-                video_clip.close()
-            
-            # Clean up temporary video
-            if os.path.exists(temp_video_path):
-                Logger.debug("Removing temporary video file")
-                os.remove(temp_video_path)
+            # Mux audio with ffmpeg in one pass: the video stream is copied
+            # untouched. Preferred path is a single pre-assembled WAV (one
+            # demuxer, no filter graph); otherwise each clip is delayed to
+            # its start time and mixed
+            Logger.info("Combining video with audio...")
+            full_audio = self._build_audio_track(current_time, "output/full_audio.wav")
+            if full_audio:
+                try:
+                    subprocess.run([
+                        self._ffmpeg_path(), "-y", "-i", temp_video_path, "-i", full_audio,
+                        "-c:v", "copy", "-c:a", "aac", "-shortest", output_path
+                    ], check=True, capture_output=True)
+                except subprocess.CalledProcessError as e:
+                    Logger.error(f"Error combining audio: {e}")
+                    Logger.warning("Saving video without audio due to error")
+                    shutil.copyfile(temp_video_path, output_path)
+                if os.path.exists(full_audio):
+                    os.remove(full_audio)
+                self._finish_video(temp_video_path, frames_dir, output_path)
+                return True
+
+            cmd = [self._ffmpeg_path(), "-y", "-i", temp_video_path]
+            filters = []
+            labels = []
+            index = 0
+            for audio_file, start_time in self.audio_segments:
+                if not os.path.exists(audio_file):
+                    Logger.warning(f"Missing audio segment: {audio_file}")
+                    continue
+                cmd += ["-i", audio_file]
+                index += 1
+                delay_ms = int(start_time * 1000)
+                filters.append(f"[{index}:a]adelay={delay_ms}|{delay_ms}[a{index}]")
+                labels.append(f"[a{index}]")
+
+            if labels:
+                filter_complex = ("; ".join(filters) + "; " + "".join(labels) +
+                                  f"amix=inputs={len(labels)}:duration=longest:normalize=0[aout]")
+                cmd += ["-filter_complex", filter_complex,
+                        "-map", "0:v", "-map", "[aout]",
+                        "-c:v", "copy", "-c:a", "aac", output_path]
+                try:
+                    subprocess.run(cmd, check=True, capture_output=True)
+                except subprocess.CalledProcessError as e:
+                    Logger.error(f"Error combining audio: {e}")
+                    # If audio fails, just save the video without audio
+                    Logger.warning("Saving video without audio due to error")
+                    shutil.copyfile(temp_video_path, output_path)
+            else:
+                shutil.copyfile(temp_video_path, output_path)
             
-            self.status_message = "Video creation completed"
-            Logger.success(f"Video creation completed: {output_path}")
+            self._finish_video(temp_video_path, frames_dir, output_path)
             return True
-            
+
         except Exception as e:
             Logger.error(f"Error creating video: {e}")
             self.show_error_message(f"Error creating video: {str(e)}")
             return False
+
+    def _finish_video(self, temp_video_path, frames_dir, output_path):
+        """Remove intermediate files and report completion."""
+        if os.path.exists(temp_video_path):
+            Logger.debug("Removing temporary video file")
+            os.remove(temp_video_path)
+        shutil.rmtree(frames_dir, ignore_errors=True)
+        self.status_message = "Video creation completed"
+        Logger.success(f"Video creation completed: {output_path}")
         
     def cleanup(self):
         try:
             Logger.info("Starting cleanup...")
-            if self.tts_engine:
+            Logger.debug("Shutting down analysis workers")
+            self._analysis_pool.shutdown(wait=False)
+            self._side_pool.shutdown(wait=False)
+            self._tts_pool.shutdown(wait=False)
+            if self._eval_shelf is not None:
+                Logger.debug("Closing analysis cache")
+                self._eval_shelf.close()
+                self._eval_shelf = None
+            # runAndWait already drains the speech queue after each
+            # utterance; stop() mid-synthesis truncates the audio, so only
+            # interrupt the engine if a synthesis is actually outstanding
+            if self.tts_engine and self._tts_busy:
                 Logger.debug("Stopping TTS engine")
                 self.tts_engine.stop()
             if os.path.exists('temp_audio.mp3'):
@@ -1234,16 +1934,29 @@ class ChessCommentator:
             Logger.error(f"Error during cleanup: {e}")
 
     def calculate_material_balance(self, board):
-        """Calculate the material balance of the position."""
+        """Material balance, maintained incrementally as moves are played.
+
+        Material only changes on captures and promotions, so
+        update_captured_pieces adjusts the running total and this is just
+        an attribute read on the draw path.
+        """
+        return self._material_balance
+
+    def _count_material(self, board):
+        """Full material recount from the piece bitboards."""
+        # Popcount the piece bitboards directly: five AND+popcount pairs
+        # per side instead of probing all 64 squares through piece_at
+        # (which allocates a Piece object for every hit)
+        white = board.occupied_co[chess.WHITE]
+        black = board.occupied_co[chess.BLACK]
         balance = 0
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece:
-                value = self.PIECE_VALUES[piece.piece_type]
-                if piece.color == chess.WHITE:
-                    balance += value
-                else:
-                    balance -= value
+        for bb, piece_type in ((board.pawns, chess.PAWN),
+                               (board.knights, chess.KNIGHT),
+                               (board.bishops, chess.BISHOP),
+                               (board.rooks, chess.ROOK),
+                               (board.queens, chess.QUEEN)):
+            value = self.PIECE_VALUES[piece_type]
+            balance += value * (popcount(bb & white) - popcount(bb & black))
         return balance
 
     def draw_material_bar(self, balance):
@@ -1254,7 +1967,7 @@ class ChessCommentator:
         y = self.WINDOW_HEIGHT - 150
         
         # Draw background
-        pygame.draw.rect(self.window, (50, 50, 50),
+        pygame.draw.rect(self.canvas, (50, 50, 50),
                         (x, y, bar_width, bar_height))
         
         # Calculate bar position and width
@@ -1263,20 +1976,20 @@ class ChessCommentator:
         advantage_width = min(abs(balance) / max_advantage * (bar_width // 2), bar_width // 2)
         
         if balance > 0:  # White advantage
-            pygame.draw.rect(self.window, (220, 220, 220),
+            pygame.draw.rect(self.canvas, (220, 220, 220),
                            (center_x, y, advantage_width, bar_height))
         else:  # Black advantage
-            pygame.draw.rect(self.window, (50, 50, 50),
+            pygame.draw.rect(self.canvas, (50, 50, 50),
                            (center_x - advantage_width, y, advantage_width, bar_height))
         
         # Draw center line
-        pygame.draw.line(self.window, (128, 128, 128),
+        pygame.draw.line(self.canvas, (128, 128, 128),
                         (center_x, y), (center_x, y + bar_height), 2)
         
         # Draw advantage text
         advantage_text = f"{abs(balance):+.1f} {'White' if balance > 0 else 'Black'}"
-        text = self.font.render(advantage_text, True, self.TEXT_COLOR)
-        self.window.blit(text, (x + bar_width + 10, y))
+        text = self._render_text(advantage_text, self.TEXT_COLOR)
+        self.canvas.blit(text, (x + bar_width + 10, y))
 
     def draw_captured_pieces(self):
         """Draw the captured pieces for each side."""
@@ -1285,29 +1998,43 @@ class ChessCommentator:
         y_black = self.WINDOW_HEIGHT - 50
         
         # Draw headers
-        white_text = self.font.render("White captures:", True, self.TEXT_COLOR)
-        black_text = self.font.render("Black captures:", True, self.TEXT_COLOR)
-        self.window.blit(white_text, (x, y_white - 20))
-        self.window.blit(black_text, (x, y_black - 20))
+        white_text = self._render_text("White captures:", self.TEXT_COLOR)
+        black_text = self._render_text("Black captures:", self.TEXT_COLOR)
+        self.canvas.blit(white_text, (x, y_white - 20))
+        self.canvas.blit(black_text, (x, y_black - 20))
         
         # Draw captured pieces
         spacing = 30
         for i, piece in enumerate(self.captured_pieces['white']):
-            if str(piece) in self.pieces:
-                piece_surface = pygame.transform.scale(self.pieces[str(piece)], (25, 25))
-                self.window.blit(piece_surface, (x + i * spacing, y_white))
-                
+            piece_surface = self._small_pieces.get(str(piece))
+            if piece_surface:
+                self.canvas.blit(piece_surface, (x + i * spacing, y_white))
+
         for i, piece in enumerate(self.captured_pieces['black']):
-            if str(piece) in self.pieces:
-                piece_surface = pygame.transform.scale(self.pieces[str(piece)], (25, 25))
-                self.window.blit(piece_surface, (x + i * spacing, y_black))
+            piece_surface = self._small_pieces.get(str(piece))
+            if piece_surface:
+                self.canvas.blit(piece_surface, (x + i * spacing, y_black))
+
+    def update_captured_pieces(self, board, move, captured_piece=None):
+        """Update the captured-piece lists and the running material balance.
 
-    def update_captured_pieces(self, board, move):
-        """Update the list of captured pieces after a move."""
+        Called once per move with the board *before* the push. The caller
+        may pass the piece on move.to_square to save re-probing it.
+        """
         if board.is_capture(move):
-            captured_piece = board.piece_at(move.to_square)
+            if board.is_en_passant(move):
+                captured_sq = move.to_square + (-8 if board.turn == chess.WHITE else 8)
+                captured_piece = board.piece_at(captured_sq)
+            elif captured_piece is None:
+                captured_piece = board.piece_at(move.to_square)
             if captured_piece:
+                value = self.PIECE_VALUES[captured_piece.piece_type]
                 if captured_piece.color == chess.WHITE:
                     self.captured_pieces['black'].append(captured_piece)
+                    self._material_balance -= value
                 else:
-                    self.captured_pieces['white'].append(captured_piece) 
\ No newline at end of file
+                    self.captured_pieces['white'].append(captured_piece)
+                    self._material_balance += value
+        if move.promotion:
+            delta = self.PIECE_VALUES[move.promotion] - self.PIECE_VALUES[chess.PAWN]
+            self._material_balance += delta if board.turn == chess.WHITE else -delta 
\ No newline at end of file
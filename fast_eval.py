@@ -0,0 +1,34 @@
+"""Optional Numba-accelerated bitboard helpers for per-move evaluation.
+
+The position-strength code in ChessCommentator boils down to popcounts
+over 64-bit bitboards. When numba is installed these are JIT-compiled
+(with an explicit signature so compilation happens at import, not on the
+first move); otherwise a plain-Python fallback is used, which is already
+just one C-level call per bitboard.
+"""
+
+try:
+    from numba import njit
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+
+
+def popcount(bb):
+    """Number of set bits in a 64-bit bitboard."""
+    return bin(bb).count("1")
+
+
+if _HAVE_NUMBA:
+    # Eager compilation: the signature forces the JIT cost to import time
+    @njit("uint64(uint64)", cache=True)
+    def _popcount_jit(bb):
+        count = 0
+        while bb:
+            bb &= bb - 1  # clear the lowest set bit
+            count += 1
+        return count
+
+    def popcount(bb):
+        """Number of set bits in a 64-bit bitboard (JIT-compiled)."""
+        return int(_popcount_jit(bb))
@@ -7,16 +7,39 @@ from reportlab.lib.units import inch
 import chess
 import chess.pgn
 import pygame
-import numpy as np
 from PIL import Image as PILImage
+from concurrent.futures import ThreadPoolExecutor
 import io
 
+# reportlab's page splitter is quadratic on very tall tables, so long
+# move listings are emitted as a run of smaller tables instead
+_MAX_ROWS_PER_TABLE = 50
+
+# Both report tables share the same look; TableStyle parses and validates
+# every directive, so build it once at import instead of per table
+_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 14),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
 class GameReport:
     def __init__(self, commentator):
         self.commentator = commentator
         self.styles = getSampleStyleSheet()
         self.doc = None
         self.story = []
+        # PNG encodes run off the main thread (zlib releases the GIL), so
+        # captures overlap with the next move's rendering and analysis
+        self._png_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
         
         # Create custom styles
         self.styles.add(ParagraphStyle(
@@ -33,61 +56,81 @@ class GameReport:
         ))
         
     def capture_position(self):
-        """Capture the current board position as an image."""
-        # Convert pygame surface to PIL Image
-        string_image = pygame.image.tostring(self.commentator.window, 'RGB')
-        pil_image = PILImage.frombytes('RGB', 
-                                      (self.commentator.WINDOW_WIDTH, 
-                                       self.commentator.WINDOW_HEIGHT), 
-                                      string_image)
-        
-        # Save to bytes buffer
+        """Capture the current board position, returning a PNG future.
+
+        The result resolves to a BytesIO PNG buffer; add_move_analysis
+        accepts the future directly.
+        """
+        # Convert pygame surface to PIL Image; the commentator draws to its
+        # offscreen canvas, the window is only blitted in interactive mode.
+        # pixels3d gives a zero-copy view of the surface pixels (WxHx3), so
+        # the only copy is the one fromarray makes into the PIL image -
+        # which also snapshots the frame before the canvas is redrawn
+        arr = pygame.surfarray.pixels3d(self.commentator.canvas)
+        pil_image = PILImage.fromarray(arr.swapaxes(0, 1), 'RGB')
+        del arr  # release the surface lock held by the pixel view
+
+        return self._png_pool.submit(self._encode_png, pil_image)
+
+    @staticmethod
+    def _encode_png(pil_image):
+        # platypus.Image only takes a path or a file-like with read(), so
+        # the PNG buffer stays. compress_level=1 because these are per-move
+        # thumbnails for a PDF - encode speed matters, size does not
         img_byte_arr = io.BytesIO()
-        pil_image.save(img_byte_arr, format='PNG')
+        pil_image.save(img_byte_arr, format='PNG', compress_level=1)
         img_byte_arr.seek(0)
-        
         return img_byte_arr
         
     def add_move_analysis(self, move_number, position_image, move, analysis):
         """Add analysis of a single move to the report."""
-        # Move header
-        self.story.append(Paragraph(f"Move {move_number}: {move}", self.styles['MoveHeader']))
-        
-        # Add position image
-        img = Image(position_image, width=6*inch, height=4*inch)
-        self.story.append(img)
-        self.story.append(Spacer(1, 12))
-        
+        # Bind the styles once and build the move's flowables locally; one
+        # extend at the end beats ~15 append calls per move
+        normal = self.styles['Normal']
+        heading3 = self.styles['Heading3']
+        flow = [Paragraph(f"Move {move_number}: {move}", self.styles['MoveHeader'])]
+
+        # Add position image, waiting for its background encode if the
+        # caller handed over the future from capture_position
+        if hasattr(position_image, 'result'):
+            position_image = position_image.result()
+        flow.append(Image(position_image, width=6*inch, height=4*inch))
+        flow.append(Spacer(1, 12))
+
         # Add computer analysis
         if analysis:
             # Best move analysis
             if 'text' in analysis:
-                self.story.append(Paragraph(f"Computer Analysis:", self.styles['Heading3']))
-                self.story.append(Paragraph(analysis['text'], self.styles['Normal']))
-            
+                flow.append(Paragraph("Computer Analysis:", heading3))
+                flow.append(Paragraph(analysis['text'], normal))
+
             # Reasoning
             if 'reasoning' in analysis:
-                self.story.append(Paragraph(f"Reasoning:", self.styles['Heading3']))
-                self.story.append(Paragraph(analysis['reasoning'], self.styles['Normal']))
-            
-            # Consequences
+                flow.append(Paragraph("Reasoning:", heading3))
+                flow.append(Paragraph(analysis['reasoning'], normal))
+
+            # Consequences - joined into one Paragraph so reportlab parses
+            # and lays out a single flowable instead of one per bullet
             if 'consequences' in analysis:
-                self.story.append(Paragraph(f"Expected Consequences:", self.styles['Heading3']))
-                for consequence in analysis['consequences']:
-                    self.story.append(Paragraph(f"• {consequence}", self.styles['Normal']))
-            
-            # Alternative moves
+                flow.append(Paragraph("Expected Consequences:", heading3))
+                bullets = "<br/>".join(f"• {c}" for c in analysis['consequences'])
+                flow.append(Paragraph(bullets, normal))
+
+            # Alternative moves, likewise one flowable for the whole list
             if 'alternatives' in analysis:
-                self.story.append(Paragraph(f"Alternative Moves:", self.styles['Heading3']))
+                flow.append(Paragraph("Alternative Moves:", heading3))
+                lines = []
                 for alt in analysis['alternatives']:
                     move_text = f"• {alt['move']}"
                     if 'score' in alt:
                         move_text += f" (Evaluation: {alt['score']/100:.2f})"
-                    self.story.append(Paragraph(move_text, self.styles['Normal']))
+                    lines.append(move_text)
                     if 'reasoning' in alt:
-                        self.story.append(Paragraph(f"  - {alt['reasoning']}", self.styles['Normal']))
-        
-        self.story.append(Spacer(1, 20))
+                        lines.append(f"  - {alt['reasoning']}")
+                flow.append(Paragraph("<br/>".join(lines), normal))
+
+        flow.append(Spacer(1, 20))
+        self.story.extend(flow)
         
     def add_notable_moves_section(self):
         """Add a section listing all notable moves."""
@@ -104,30 +147,23 @@ class GameReport:
         for title, moves in categories:
             self.story.append(Paragraph(title, self.styles['Heading2']))
             if moves['white'] or moves['black']:
-                data = [['Side', 'Move', 'Evaluation']]
+                rows = []
                 for side in ['white', 'black']:
                     for move_info in moves[side]:
-                        data.append([
+                        rows.append([
                             side.capitalize(),
                             move_info['move'],
                             move_info['evaluation']
                         ])
-                
-                table = Table(data)
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 14),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 1), (-1, -1), 12),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                self.story.append(table)
+
+                # Emit the rows in bounded batches (each with its own
+                # header) so the page splitter never sees a huge table
+                header = ['Side', 'Move', 'Evaluation']
+                for start in range(0, len(rows), _MAX_ROWS_PER_TABLE):
+                    table = Table([header] + rows[start:start + _MAX_ROWS_PER_TABLE])
+                    table.setStyle(_TABLE_STYLE)
+                    self.story.append(table)
+                    self.story.append(Spacer(1, 6))
             else:
                 self.story.append(Paragraph("None", self.styles['Normal']))
             
@@ -137,42 +173,36 @@ class GameReport:
         """Add a section showing player scores and statistics."""
         self.story.append(Paragraph("Player Performance", self.styles['CustomHeading1']))
         
+        # Count every category for both sides in one sweep of notable_moves
+        notable = self.commentator.notable_moves
+        counts = {
+            side: {cat: len(notable[cat][side])
+                   for cat in ('blunders', 'mistakes', 'good_moves', 'missed_wins')}
+            for side in ('white', 'black')
+        }
+
         # Create a table for scores
         data = [
             ['Player', 'Score', 'Notable Statistics'],
-            ['White', f"{self.commentator.player_scores['white']}/100", self.get_player_stats('white')],
-            ['Black', f"{self.commentator.player_scores['black']}/100", self.get_player_stats('black')]
+            ['White', f"{self.commentator.player_scores['white']}/100", self.get_player_stats(counts['white'])],
+            ['Black', f"{self.commentator.player_scores['black']}/100", self.get_player_stats(counts['black'])]
         ]
         
         table = Table(data, colWidths=[1.5*inch, inch, 3.5*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
+        table.setStyle(_TABLE_STYLE)
+
         self.story.append(table)
         self.story.append(Spacer(1, 20))
         
-    def get_player_stats(self, side):
-        """Generate statistics for a player."""
+    def get_player_stats(self, counts):
+        """Format one side's notable-move counts (see add_player_scores)."""
         stats = []
-        moves = self.commentator.notable_moves
-        
-        # Count notable moves
-        blunders = len(moves['blunders'][side])
-        mistakes = len(moves['mistakes'][side])
-        good_moves = len(moves['good_moves'][side])
-        missed_wins = len(moves['missed_wins'][side])
-        
+        blunders = counts['blunders']
+        mistakes = counts['mistakes']
+        good_moves = counts['good_moves']
+        missed_wins = counts['missed_wins']
+
+
         if blunders > 0:
             stats.append(f"{blunders} blunder{'s' if blunders > 1 else ''}")
         if mistakes > 0:
@@ -186,7 +216,6 @@ class GameReport:
         
     def generate_report(self, output_path):
         """Generate the complete game report."""
-        self.doc = SimpleDocTemplate(output_path, pagesize=letter)
         self.story = []
         
         # Title
@@ -225,5 +254,8 @@ class GameReport:
         # Player scores and statistics
         self.add_player_scores()
         
-        # Build the PDF
-        self.doc.build(self.story) 
\ No newline at end of file
+        # Build the PDF through a large write buffer so reportlab's many
+        # small writes coalesce instead of hitting the OS one by one
+        with open(output_path, 'wb', buffering=1 << 20) as pdf_file:
+            self.doc = SimpleDocTemplate(pdf_file, pagesize=letter)
+            self.doc.build(self.story)
@@ -1,41 +1,61 @@
 import sys
-from datetime import datetime
+import time
 from colorama import init, Fore, Style
 
 # Initialize colorama for Windows support
 init()
 
+# Build the per-level prefixes once at import instead of concatenating
+# colorama objects on every call. When stdout is not a terminal (logs
+# redirected to a file or CI capture) skip the ANSI codes entirely.
+_COLORIZE = sys.stdout.isatty()
+_RESET = Style.RESET_ALL if _COLORIZE else ""
+
+def _prefix(color, tag):
+    return f"{color}[{tag}] " if _COLORIZE else f"[{tag}] "
+
+_INFO_PREFIX = _prefix(Fore.BLUE, "INFO")
+_WARNING_PREFIX = _prefix(Fore.YELLOW, "WARNING")
+_ERROR_PREFIX = _prefix(Fore.RED, "ERROR")
+_SUCCESS_PREFIX = _prefix(Fore.GREEN, "SUCCESS")
+_DEBUG_PREFIX = _prefix(Fore.CYAN, "DEBUG")
+
 class Logger:
     @staticmethod
     def _get_timestamp():
-        return datetime.now().strftime('%H:%M:%S.%f')[:-3]
+        # time.time + localtime is noticeably cheaper than building a
+        # datetime and running a full strftime for every log line
+        t = time.time()
+        ms = int((t - int(t)) * 1000)
+        lt = time.localtime(t)
+        return f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}.{ms:03d}"
 
     @staticmethod
-    def info(message):
+    def _log(prefix, message, flush=False):
+        # One write per line; stdout is line-buffered on a tty anyway, so
+        # an explicit flush (a syscall per message) is only worth it for
+        # errors that must land before a potential crash
         timestamp = Logger._get_timestamp()
-        print(f"{Fore.BLUE}[INFO] {timestamp} - {message}{Style.RESET_ALL}")
-        sys.stdout.flush()
+        sys.stdout.write(f"{prefix}{timestamp} - {message}{_RESET}\n")
+        if flush:
+            sys.stdout.flush()
+
+    @staticmethod
+    def info(message):
+        Logger._log(_INFO_PREFIX, message)
 
     @staticmethod
     def warning(message):
-        timestamp = Logger._get_timestamp()
-        print(f"{Fore.YELLOW}[WARNING] {timestamp} - {message}{Style.RESET_ALL}")
-        sys.stdout.flush()
+        Logger._log(_WARNING_PREFIX, message)
 
     @staticmethod
     def error(message):
-        timestamp = Logger._get_timestamp()
-        print(f"{Fore.RED}[ERROR] {timestamp} - {message}{Style.RESET_ALL}")
-        sys.stdout.flush()
+        Logger._log(_ERROR_PREFIX, message, flush=True)
 
     @staticmethod
     def success(message):
-        timestamp = Logger._get_timestamp()
-        print(f"{Fore.GREEN}[SUCCESS] {timestamp} - {message}{Style.RESET_ALL}")
-        sys.stdout.flush()
+        Logger._log(_SUCCESS_PREFIX, message)
 
     @staticmethod
     def debug(message):
-        timestamp = Logger._get_timestamp()
-        print(f"{Fore.CYAN}[DEBUG] {timestamp} - {message}{Style.RESET_ALL}")
-        sys.stdout.flush() 
\ No newline at end of file
+        Logger._log(_DEBUG_PREFIX, message)
@@ -1,6 +1,6 @@
 from chess_commentator import ChessCommentator
-from game_report import GameReport
 from logger import Logger
+import functools
 import os
 import sys
 import time
@@ -8,23 +8,33 @@ import tkinter as tk
 from tkinter import filedialog
 import shutil
 
+_HERE = os.path.dirname(__file__)
+
+@functools.lru_cache(maxsize=1)
+def _resolve_stockfish():
+    """Locate the Stockfish binary, checking the bundled copy then PATH.
+
+    Cached so the disk probes (os.path.exists plus a shutil.which walk of
+    PATH) run at most once per process, and only when main() actually
+    needs an engine.
+    """
+    stockfish_path = os.path.join(_HERE, "0.1.0", "stockfish", "stockfish-windows-x86-64-avx2.exe")
+    if not os.path.exists(stockfish_path):
+        Logger.warning(f"Stockfish not found at: {stockfish_path}")
+        # Try to find Stockfish in system PATH
+        stockfish_path = shutil.which('stockfish')
+        if stockfish_path:
+            Logger.info(f"Found Stockfish in PATH: {stockfish_path}")
+    return stockfish_path
+
 def main():
     try:
         # Hide the main tkinter window
         root = tk.Tk()
         root.withdraw()
-        
-        # Get Stockfish path
-        stockfish_path = os.path.join(os.path.dirname(__file__), "0.1.0", "stockfish", "stockfish-windows-x86-64-avx2.exe")
-        if not os.path.exists(stockfish_path):
-            Logger.warning(f"Stockfish not found at: {stockfish_path}")
-            # Try to find Stockfish in system PATH
-            stockfish_path = shutil.which('stockfish')
-            if stockfish_path:
-                Logger.info(f"Found Stockfish in PATH: {stockfish_path}")
-        
+
         # Initialize commentator
-        commentator = ChessCommentator(stockfish_path)
+        commentator = ChessCommentator(_resolve_stockfish())
         
         # Create output directory if it doesn't exist
         os.makedirs("output", exist_ok=True)
@@ -44,7 +54,9 @@ def main():
         video_output = os.path.join("output", f"{base_name}.mp4")
         report_output = os.path.join("output", f"{base_name}_analysis.pdf")
         
-        # Create game report instance
+        # Create game report instance (imported here so reportlab/PIL only
+        # load once a game has actually been selected)
+        from game_report import GameReport
         report = GameReport(commentator)
         
         # Create video and capture positions for report